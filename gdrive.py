@@ -13,39 +13,112 @@ Key Concepts:
 """
 
 # Third-party imports for Google Drive API
-import pickle  # For saving/loading authentication tokens
+import http.client  # For the "connection dropped" errors of an HTTP request
+import json  # For reading the saved authentication token
+import logging  # For progress messages that respect --verbose / --quiet
+import mimetypes  # For guessing a file's MIME type from its extension
+import mmap  # For reading files through memory mapping instead of read() calls
+import os  # For fast directory listing with os.scandir()
+import random  # For adding jitter to retry delays
+import socket  # For the timeout error of a network request
+import sqlite3  # For the local manifest of already-uploaded files
+import ssl  # For errors in the encrypted (HTTPS) connection
+import threading  # For giving each upload worker its own Drive service
+import time  # For sleeping between retries
+from concurrent.futures import (  # For uploading several files at once
+    ThreadPoolExecutor,
+    as_completed,
+)
 from pathlib import Path
 
+import httplib2  # HTTP client used by the Google API library
 from google.auth.transport.requests import Request  # For refreshing tokens
+from google.oauth2.credentials import Credentials  # Authorized-user credentials
+from google_auth_httplib2 import AuthorizedHttp  # Adds auth headers to httplib2 requests
 from google_auth_oauthlib.flow import InstalledAppFlow  # OAuth flow for desktop apps
 from googleapiclient.discovery import build  # Builds the Drive API service object
-from googleapiclient.http import MediaFileUpload  # For uploading files to Drive
+from googleapiclient.errors import HttpError  # Raised when a Drive API call fails
+from googleapiclient.http import MediaIoBaseUpload  # For uploading files to Drive
 
-# Path to store authentication token
-# pickle format is a Python-specific binary format for saving objects
-pickel_path = Path("token.pickle")  # Note: "pickel" appears to be a typo for "pickle"
+# Configure logger for this module
+logger = logging.getLogger(__name__)
 
-def authenticate_drive():
+# Define what permissions we need from Google Drive
+# This scope gives full read/write access to Drive
+SCOPES = ["https://www.googleapis.com/auth/drive"]
+
+# Path to store authentication token
+# JSON is human-readable and, unlike pickle, can't run code when loaded
+token_path = Path("token.json")
+
+# Local database remembering which files were already uploaded (and to which folder)
+# Lets a re-run skip files that haven't changed since the last upload
+UPLOAD_MANIFEST_PATH = Path("upload_manifest.db")
+
+# Credentials from get_drive_credentials() and the Drive service built by
+# authenticate_drive(), reused if they're called again
+_cached_credentials = None
+_cached_service = None
+
+# How many files are uploaded at the same time
+# Uploads spend most of their time waiting on the network, so a handful of
+# threads gives a big speedup without hitting Drive's per-user rate limit
+UPLOAD_WORKERS = 8
+
+# Files smaller than this are sent in a single request (simple upload)
+# Larger files use a resumable upload, sent in chunks of RESUMABLE_CHUNK_SIZE
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024  # 5 MB
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB (must be a multiple of 256 KB)
+
+# How many times a failed Drive API call is retried before giving up
+# (only for errors that are worth retrying - see _is_retryable_error())
+MAX_RETRIES = 6
+
+# Longest wait between two retries, in seconds
+RETRY_MAX_WAIT = 64
+
+# Network errors that usually go away on their own, so the request is retried
+# (a timeout, a dropped or reset connection, a broken HTTPS connection)
+# ConnectionError covers ConnectionResetError, BrokenPipeError, etc.
+TRANSIENT_NETWORK_ERRORS = (
+    socket.timeout,
+    ConnectionError,
+    ssl.SSLError,
+    http.client.HTTPException,
+)
+
+# How many folder-creation requests are sent together in one batch HTTP request
+# Drive accepts at most 100 calls per batch
+FOLDER_BATCH_SIZE = 100
+
+# Seconds to wait for Drive to respond before giving up on a request
+HTTP_TIMEOUT = 120
+
+# Each upload thread stores its own Drive service here
+# googleapiclient service objects are NOT thread-safe, so threads can't share one
+_thread_local = threading.local()
+
+def get_drive_credentials():
     """
-    Authenticate with Google Drive API and return a service object.
+    Sign in to Google Drive and return the credentials.
 
     WHAT THIS DOES:
     Handles the authentication process with Google Drive. If you've authenticated before,
     it loads the saved token. Otherwise, it opens a browser for you to sign in.
 
     HOW IT WORKS:
-    1. Checks if we have a saved token (token.pickle)
+    1. Checks if we have a saved token (token.json)
     2. If token exists and is valid → use it
     3. If token expired → refresh it
     4. If no token → open browser for new authentication
-    5. Save token for next time
-    6. Return a service object that can interact with Drive
+    5. Save token for next time (only if it changed)
+    6. Return the credentials (authenticate_drive() builds a service from them)
 
     Returns:
-        Service object: A Google Drive API service that can create folders, upload files, etc.
+        Credentials: Authenticated Google credentials (the same object on every call)
 
     EXAMPLE:
-        service = authenticate_drive()
+        credentials = get_drive_credentials()
         # First time: Browser opens, you sign in, grant permissions
         # Next time: Uses saved token, no browser needed
 
@@ -55,18 +128,29 @@ def authenticate_drive():
         - Token: Encrypted credentials that prove we have permission
         - Refresh: Tokens expire; refresh gets a new one without re-authenticating
     """
-    # Define what permissions we need from Google Drive
-    # This scope gives full read/write access to Drive
-    SCOPES = ["https://www.googleapis.com/auth/drive"]
+    global _cached_credentials
+
+    # Already authenticated in this run - reuse the same credentials
+    if _cached_credentials is not None:
+        return _cached_credentials
 
     creds = None  # Will store credentials object
+    saved_token = None  # Token file contents, to detect whether it changed
 
     # Check if we have a saved token from a previous authentication
-    if pickel_path.exists():
-        # Load the saved credentials from the pickle file
-        # read_bytes() reads the file as binary data
-        # pickle.loads() converts binary data back into Python object
-        creds = pickle.loads(pickel_path.read_bytes())
+    # The file is tiny, so it's read in one unbuffered read() call
+    try:
+        with open(token_path, "rb", buffering=0) as token_file:
+            saved_token = token_file.read().decode("utf-8")
+    except FileNotFoundError:
+        pass  # No saved token yet - first run
+
+    if saved_token is not None:
+        # Load the saved credentials from the JSON token file
+        creds = Credentials.from_authorized_user_info(json.loads(saved_token), SCOPES)
+
+    # Remember the access token we started with, to detect whether it changed
+    old_token = getattr(creds, "token", None)
 
     # Check if credentials are valid
     if not creds or not creds.valid:
@@ -88,17 +172,194 @@ def authenticate_drive():
             # Opens browser, user signs in, grants permissions
             creds = flow.run_local_server(port=0)
 
-        # Save the credentials (or refreshed credentials) for next time
-        # pickle.dumps() converts Python object to binary data
-        # write_bytes() writes binary data to file
-        pickel_path.write_bytes(pickle.dumps(creds))
+    # Save the credentials for next time - but only if we got a new token
+    # (a still-valid token doesn't need to be rewritten on every run)
+    # Comparing the token itself, not the whole JSON, matters: to_json() doesn't
+    # round-trip the expiry time exactly, so the JSON text can differ even
+    # when nothing changed
+    if saved_token is None or creds.token != old_token:
+        token_path.write_text(creds.to_json())
+
+    _cached_credentials = creds
+    return creds
+
+
+def authenticate_drive():
+    """
+    Authenticate with Google Drive API and return a service object.
 
-    # Build and return the Drive API service object
-    # "drive" = service name
-    # "v3" = API version
-    # credentials = our authenticated credentials
+    Signs in with get_drive_credentials() (opening the browser only if there's
+    no valid saved token) and builds the Drive service on top of it.
+
+    Returns:
+        Service object: A Google Drive API service that can create folders, upload files, etc.
+
+    EXAMPLE:
+        service = authenticate_drive()
+        # First time: Browser opens, you sign in, grant permissions
+        # Next time: Uses saved token, no browser needed
+    """
+    global _cached_service
+
+    # Build the Drive API service object (once - reused if called again)
     # This service object is what we use to make API calls
-    return build("drive", "v3", credentials=creds)
+    if _cached_service is None:
+        _cached_service = _build_service(get_drive_credentials())
+    return _cached_service
+
+
+def _build_service(credentials):
+    """
+    Build a Drive API service on top of a single, long-lived HTTP connection pool.
+
+    WHAT THIS DOES:
+    Every request made through the returned service goes through the same
+    httplib2.Http object, which keeps its HTTPS connection open between requests.
+    This means the (slow) TLS handshake happens once per service instead of
+    once per file.
+
+    Args:
+        credentials: Authenticated Google credentials
+
+    Returns:
+        Service object: A Google Drive API service
+
+    NOTE:
+        The Google API library only accepts httplib2-style HTTP objects, so the
+        connection reuse comes from httplib2 itself. One service (and so one
+        connection) is built per upload thread - see _get_thread_service().
+    """
+    http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+
+    # static_discovery=True: use the Drive API description bundled with the
+    # library instead of downloading it, and skip the (unused) discovery cache
+    return build("drive", "v3", http=http, static_discovery=True, cache_discovery=False)
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """
+    Check if a Drive API error is temporary, so the request can simply be retried.
+
+    Network errors (a timeout, a reset connection, ...) are temporary. Drive answers with HTTP 429, or HTTP 403 with reason "userRateLimitExceeded" /
+    "rateLimitExceeded", when we send requests too quickly. HTTP 5xx errors mean
+    something went wrong on Google's side and usually go away on their own.
+
+    Args:
+        error (HttpError | network error): The error raised by a Drive API call
+
+    Returns:
+        bool: True if the request can be retried after waiting
+    """
+    if not isinstance(error, HttpError):
+        # A network error (see TRANSIENT_NETWORK_ERRORS) - retry it, unless the
+        # server's certificate is wrong (that won't fix itself)
+        return not isinstance(error, ssl.SSLCertVerificationError)
+
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    # 403 is also used for permission errors - only retry the rate-limit ones
+    return status == 403 and b"ratelimitexceeded" in (error.content or b"").lower()
+
+
+def _execute_with_retry(request):
+    """
+    Execute a Drive API request, retrying with exponential backoff on temporary errors.
+
+    WHAT THIS DOES:
+    Google Drive limits how many requests per second a user can make, and
+    occasionally fails with a server error (or the network drops the
+    connection). Instead of crashing (and throwing
+    away the rest of the upload) we wait a bit and try again, allowing up to
+    twice as long each time (2s, 4s, 8s, ... up to RETRY_MAX_WAIT).
+    If Drive says how long to wait (a "Retry-After" header), we wait at least
+    that long - retrying sooner would only be rejected again.
+
+    Args:
+        request: A Drive API request object (e.g. service.files().create(...))
+
+    Returns:
+        dict: The API response
+
+    Raises:
+        HttpError (or a network error): If the error is not temporary, or
+                                        retries are exhausted
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return request.execute()
+        except (HttpError, *TRANSIENT_NETWORK_ERRORS) as e:
+            if attempt == MAX_RETRIES or not _is_retryable_error(e):
+                raise
+            # Wait a random time between 1 second and the current limit
+            # ("full jitter"), so parallel workers that failed together
+            # spread out instead of all retrying at exactly the same moment
+            delay = random.uniform(1, min(RETRY_MAX_WAIT, 2 ** (attempt + 1)))
+
+            if isinstance(e, HttpError):
+                # Retry-After is given in seconds (it can also be a date, which
+                # Drive doesn't use - that case is simply ignored)
+                retry_after = e.resp.get("retry-after", "")
+                if retry_after.isdigit():
+                    delay = max(delay, min(int(retry_after), RETRY_MAX_WAIT))
+                logger.debug(f"Drive returned HTTP {e.resp.status}, retrying in {delay:.1f}s")
+            else:
+                logger.debug(f"Network error ({e!r}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def _guess_mime_type(file_name: str) -> str:
+    """
+    Guess a file's MIME type from its name (e.g. "note.pdf" → "application/pdf").
+
+    Falls back to "application/octet-stream" (generic binary data) for unknown types.
+    """
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+
+def _advise_page_cache(file_handle, advice_name: str):
+    """
+    Give the OS a hint about how a file is about to be used (Linux/BSD only).
+
+    "POSIX_FADV_WILLNEED" asks the kernel to start reading the file from disk
+    in the background; "POSIX_FADV_DONTNEED" says its cached pages can be freed.
+    On systems without posix_fadvise() (macOS, Windows) this does nothing.
+    """
+    advice = getattr(os, advice_name, None)
+    if advice is not None:
+        os.posix_fadvise(file_handle.fileno(), 0, 0, advice)
+
+
+def _prefetch_file(file_path: Path):
+    """
+    Ask the OS to start reading a file that will be uploaded soon (Linux/BSD only).
+
+    The kernel reads the file into its page cache in the background, so when
+    its upload starts the data is already in memory instead of waiting on
+    the disk. Only a hint - if the file can't be opened, nothing happens.
+    """
+    if not hasattr(os, "POSIX_FADV_WILLNEED"):
+        return  # No posix_fadvise() here (macOS, Windows) - don't open the file at all
+    try:
+        with open(file_path, "rb", buffering=0) as file_handle:
+            _advise_page_cache(file_handle, "POSIX_FADV_WILLNEED")
+    except OSError:
+        pass
+
+
+def _get_thread_service(credentials):
+    """
+    Return a Drive service for the current thread, building it on first use.
+
+    Args:
+        credentials: Authenticated Google credentials shared by all threads
+
+    Returns:
+        Service object: A Drive API service used only by this thread
+    """
+    if getattr(_thread_local, "service", None) is None:
+        _thread_local.service = _build_service(credentials)
+    return _thread_local.service
 
 
 def create_drive_directory(service, name, parent_id=None):
@@ -138,7 +399,7 @@ def create_drive_directory(service, name, parent_id=None):
         - Every folder/file gets a unique ID when created
         - We need this ID to reference the folder later
     """
-    print("Creating folder:", name)
+    logger.debug(f"Creating folder: {name}")
 
     # Set up metadata for the folder
     # In Google Drive API, folders are just files with a special MIME type
@@ -158,13 +419,20 @@ def create_drive_directory(service, name, parent_id=None):
     # body = metadata (name, type, parent)
     # fields="id" = only return the ID (more efficient than returning all metadata)
     # .execute() = actually make the API call
-    folder = service.files().create(body=file_metadata, fields="id").execute()
+    # _execute_with_retry() = make the API call, retrying temporary errors
+    folder = _execute_with_retry(service.files().create(body=file_metadata, fields="id"))
 
     # Return the folder ID (we'll need this to upload files into the folder)
     return folder["id"]
 
 
-def upload_file(service, file_path: Path, parent_id: str):
+def upload_file(
+    service,
+    file_path: Path,
+    parent_id: str,
+    file_size: int | None = None,
+    mime_type: str | None = None,
+):
     """
     Upload a single file to Google Drive.
 
@@ -182,6 +450,12 @@ def upload_file(service, file_path: Path, parent_id: str):
         service: Google Drive API service object (from authenticate_drive())
         file_path (Path): Path to the file on your computer to upload
         parent_id (str): ID of the Drive folder where file should be uploaded
+        file_size (int | None): Size of the file in bytes, if already known
+                                (saves looking it up again)
+        mime_type (str | None): MIME type of the file, if already known
+
+    Returns:
+        str: The Drive ID of the uploaded file
 
     EXAMPLE:
         service = authenticate_drive()
@@ -190,11 +464,13 @@ def upload_file(service, file_path: Path, parent_id: str):
         # Uploads note.pdf into "My Notes" folder in Drive
 
     IMPORTANT CONCEPTS:
-        - resumable=True: Allows upload to resume if interrupted (good for large files)
+        - Small files (< 5 MB) are sent in one request; this saves the extra
+          round-trip a resumable upload needs to start its session
+        - resumable=True: Allows upload to resume if interrupted (used for large files)
         - parent_id: Must be a valid folder ID from create_drive_directory()
         - This only uploads ONE file - use upload_directory() for multiple files
     """
-    print("Uploading file:", file_path.name, "from the directory:", file_path.parent)
+    logger.debug(f"Uploading file: {file_path.name}")
 
     # Get just the filename (without path)
     # Example: Path("./Notes/note.pdf") → file_name = "note.pdf"
@@ -206,42 +482,294 @@ def upload_file(service, file_path: Path, parent_id: str):
         "parents": [parent_id]    # Which folder to upload into
     }
 
-    # Create media upload object
-    # MediaFileUpload handles the actual file transfer
-    # resumable=True means if upload fails, it can resume from where it stopped
-    # This is important for large files
-    media = MediaFileUpload(file_path, resumable=True)
+    # Tell Drive the file type up front so it doesn't have to detect it
+    # Example: "note.pdf" → "application/pdf"
+    if mime_type is None:
+        mime_type = _guess_mime_type(file_name)
+
+    # NOTE: Files are sent uncompressed on purpose. Drive stores the uploaded
+    # bytes exactly as received, so gzip-compressing the body would leave a
+    # compressed file in Drive. Most exported files (PDFs, images) are already
+    # compressed anyway.
+
+    if file_size is None:
+        file_size = file_path.stat().st_size
+
+    with open(file_path, "rb") as file_handle:
+        # Memory-map the file: its pages are read straight from the OS page
+        # cache when the upload needs them, without a read() call per chunk
+        # (empty files can't be memory-mapped, so those use the file directly)
+        if file_size:
+            source = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            source = file_handle
+
+        try:
+            # Create media upload object
+            # MediaIoBaseUpload handles the actual file transfer
+            # Small files: resumable=False sends the whole file in one request
+            # Large files: resumable=True sends it in chunks, and if the upload fails
+            # it can resume from where it stopped
+            media = MediaIoBaseUpload(
+                source,
+                mimetype=mime_type,
+                chunksize=RESUMABLE_CHUNK_SIZE,
+                resumable=file_size >= RESUMABLE_THRESHOLD,
+            )
+
+            # Upload the file to Google Drive
+            # service.files() = files API
+            # .create() = create new file
+            # body = file metadata (name, parent)
+            # media_body = the actual file to upload
+            # fields="id" = only return ID (more efficient)
+            # _execute_with_retry() = make the API call, retrying temporary errors
+            uploaded = _execute_with_retry(
+                service.files().create(body=file_metadata, media_body=media, fields="id")
+            )
+            return uploaded["id"]
+        finally:
+            # Always release the memory map, even if the upload failed
+            if source is not file_handle:
+                source.close()
+            # The file won't be read again - let the OS reuse that memory
+            # (helps on small machines like a Raspberry Pi)
+            _advise_page_cache(file_handle, "POSIX_FADV_DONTNEED")
+
+
+def create_drive_directories_batch(service, folders: list) -> list:
+    """
+    Create many folders in Google Drive using as few HTTP requests as possible.
 
-    # Upload the file to Google Drive
-    # service.files() = files API
-    # .create() = create new file
-    # body = file metadata (name, parent)
-    # media_body = the actual file to upload
-    # fields="id" = only return ID (more efficient)
-    # .execute() = make the API call
-    service.files().create(body=file_metadata, media_body=media, fields="id").execute()
+    WHAT THIS DOES:
+    Instead of one HTTP request per folder, folder creations are grouped into
+    batches of up to FOLDER_BATCH_SIZE and sent together in a single request.
 
+    Args:
+        service: Google Drive API service object (from authenticate_drive())
+        folders (list): List of (name, parent_id) tuples for the folders to create
 
-def upload_directory(service, local_path: Path, parent_id: str | None = None):
+    Returns:
+        list: The Drive IDs of the new folders, in the same order as "folders"
+
+    NOTE:
+        Only metadata requests (like creating folders) can be batched.
+        File uploads can't, which is why they use a thread pool instead.
+        If a request inside a batch fails (e.g. rate limit), it is retried
+        on its own with create_drive_directory().
+    """
+    folder_ids = [None] * len(folders)
+
+    # Called once for every request in the batch when the batch completes
+    # request_id is the index we gave the request when adding it
+    def callback(request_id, response, exception):
+        if exception is None:
+            folder_ids[int(request_id)] = response["id"]
+
+    for start in range(0, len(folders), FOLDER_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for index in range(start, min(start + FOLDER_BATCH_SIZE, len(folders))):
+            name, parent_id = folders[index]
+            logger.debug(f"Creating folder: {name}")
+            file_metadata = {
+                "name": name,
+                "mimeType": "application/vnd.google-apps.folder",
+                "parents": [parent_id],
+            }
+            batch.add(service.files().create(body=file_metadata, fields="id"), request_id=str(index))
+        _execute_with_retry(batch)
+
+    # Retry any folders whose request failed inside the batch, one at a time
+    for index, folder_id in enumerate(folder_ids):
+        if folder_id is None:
+            name, parent_id = folders[index]
+            folder_ids[index] = create_drive_directory(service, name, parent_id)
+
+    return folder_ids
+
+
+def open_upload_manifest(db_path: Path = UPLOAD_MANIFEST_PATH) -> sqlite3.Connection:
     """
-    Upload an entire directory (folder) and its contents to Google Drive recursively.
+    Open (or create) the local upload manifest database.
 
     WHAT THIS DOES:
-    Takes a folder on your computer and recreates its entire structure in Google Drive,
-    uploading all files and subfolders. This is a recursive function that processes
-    nested folders.
+    The manifest is a small SQLite database that remembers what has already
+    been uploaded, so running the tool again doesn't upload everything twice.
+
+    It has two tables:
+    - folders:  local folder path + Drive parent ID → Drive folder ID
+    - uploaded: local file path → modification time, size, Drive folder and file IDs
+
+    Args:
+        db_path (Path): Where the database file lives (default: ./upload_manifest.db)
+
+    Returns:
+        sqlite3.Connection: An open connection to the manifest
+
+    NOTE:
+        Delete upload_manifest.db to force everything to be uploaded again
+        (for example after deleting the uploaded folder from Drive).
+    """
+    manifest = sqlite3.connect(db_path)
+    # WAL journal + NORMAL sync: much faster writes, still safe against crashes
+    manifest.execute("PRAGMA journal_mode=WAL")
+    manifest.execute("PRAGMA synchronous=NORMAL")
+    manifest.execute(
+        "CREATE TABLE IF NOT EXISTS folders ("
+        "path TEXT, parent_id TEXT, folder_id TEXT, PRIMARY KEY (path, parent_id))"
+    )
+    manifest.execute(
+        "CREATE TABLE IF NOT EXISTS uploaded ("
+        "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, parent_id TEXT, file_id TEXT)"
+    )
+    return manifest
+
+
+def _known_folder_id(manifest, local_path: Path, parent_id: str | None) -> str | None:
+    """Return the Drive ID recorded for a local folder, or None if it wasn't created yet."""
+    if manifest is None:
+        return None
+    row = manifest.execute(
+        "SELECT folder_id FROM folders WHERE path = ? AND parent_id = ?",
+        (os.path.abspath(local_path), parent_id or ""),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _remember_folder_id(manifest, local_path: Path, parent_id: str | None, folder_id: str):
+    """Record the Drive ID created for a local folder in the manifest."""
+    if manifest is not None:
+        manifest.execute(
+            "INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+            (os.path.abspath(local_path), parent_id or "", folder_id),
+        )
+
+
+def create_drive_folder_tree(
+    service, local_path: Path, parent_id: str | None, tasks: list, manifest=None
+):
+    """
+    Recreate a local folder tree in Google Drive and collect the files to upload.
+
+    WHAT THIS DOES:
+    Walks the local folder level by level and creates every folder in Drive.
+    Files are NOT uploaded here - they are added to the "tasks" list so they
+    can be uploaded in parallel afterwards.
 
     HOW IT WORKS:
-    1. Creates a folder in Drive matching the local folder name
-    2. Loops through all items in the local folder
-    3. For each subfolder: recursively call upload_directory() (processes nested folders)
-    4. For each file: upload it to the Drive folder
-    5. Result: Complete folder structure replicated in Drive
+    1. Creates the top folder
+    2. Lists the folders on the current level and collects their subfolders
+    3. Creates all those subfolders together in batches (their parents now exist)
+    4. Repeats with the next level until there are no more subfolders
+
+    Args:
+        service: Google Drive API service object (from authenticate_drive())
+        local_path (Path): Local folder to recreate in Drive
+        parent_id (str | None): ID of the parent folder in Drive (None = Drive root)
+        tasks (list): List that receives (file_path, folder_id, file_size, mtime, mime_type)
+                      tuples - everything upload_file() needs, gathered in one pass
+        manifest (sqlite3.Connection | None): Upload manifest; folders already
+                                              recorded in it are reused, not recreated
+
+    Returns:
+        str: The Drive ID of the folder created for local_path
+
+    NOTE:
+        Folders must exist before files can be uploaded into them (files need
+        the folder's ID), which is why folder creation happens first.
+        For a tree with many folders this needs one request per batch of
+        folders on each level, instead of one request per folder.
+        The walk is a loop, not a recursive function, so very deep folder
+        trees can't hit Python's recursion limit.
+    """
+    # Create a folder in Drive with the same name as the local folder
+    # (unless a previous run already created it)
+    root_id = _known_folder_id(manifest, local_path, parent_id)
+    if root_id is None:
+        root_id = create_drive_directory(service, local_path.name, parent_id)
+        _remember_folder_id(manifest, local_path, parent_id, root_id)
+
+    # Folders on the current level whose Drive folder already exists
+    level = [(local_path, root_id)]
+
+    while level:
+        # Subfolders found on this level: (local_path, parent_drive_id)
+        subfolders = []
+        for directory, folder_id in level:
+            # os.scandir() returns entries that already know whether they are
+            # folders, so no extra system call is needed per item
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subfolders.append((Path(entry.path), folder_id))
+                    else:
+                        # File - remember it, its Drive folder, its size,
+                        # modification time (used to detect changed files) and type
+                        stat = entry.stat()
+                        tasks.append((
+                            Path(entry.path),
+                            folder_id,
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                            _guess_mime_type(entry.name),
+                        ))
+
+        # Reuse folders created by an earlier run; collect the rest for creation
+        folder_ids = [_known_folder_id(manifest, item, folder_id) for item, folder_id in subfolders]
+        missing = [index for index, known_id in enumerate(folder_ids) if known_id is None]
+
+        # Create every missing subfolder of this level together, then move one level down
+        new_ids = create_drive_directories_batch(
+            service, [(subfolders[index][0].name, subfolders[index][1]) for index in missing]
+        )
+        for index, new_id in zip(missing, new_ids):
+            folder_ids[index] = new_id
+            _remember_folder_id(manifest, subfolders[index][0], subfolders[index][1], new_id)
+
+        level = [(item, new_id) for (item, _), new_id in zip(subfolders, folder_ids)]
+
+    return root_id
+
+
+def _is_already_uploaded(manifest, task) -> bool:
+    """Check the manifest for an unchanged copy of this file in the same Drive folder."""
+    file_path, folder_id, file_size, mtime, _ = task
+    row = manifest.execute(
+        "SELECT mtime, size, parent_id FROM uploaded WHERE path = ?",
+        (os.path.abspath(file_path),),
+    ).fetchone()
+    return row == (mtime, file_size, folder_id)
+
+
+def upload_directory(
+    service,
+    local_path: Path,
+    parent_id: str | None = None,
+    manifest_path: Path | None = UPLOAD_MANIFEST_PATH,
+    credentials=None,
+):
+    """
+    Upload an entire directory (folder) and its contents to Google Drive.
+
+    WHAT THIS DOES:
+    Takes a folder on your computer and recreates its entire structure in Google Drive,
+    uploading all files and subfolders. Files that were already uploaded by an
+    earlier run (and haven't changed since) are skipped.
+
+    HOW IT WORKS (two phases):
+    1. Phase 1: Walk the local folder and create every folder in Drive
+       (level by level in batches, because each folder needs its parent's ID)
+    2. Phase 2: Upload all new or changed files in parallel using a pool of
+       worker threads (UPLOAD_WORKERS files at a time)
 
     Args:
         service: Google Drive API service object (from authenticate_drive())
         local_path (Path): Path to the local folder to upload (e.g., Path("./EverNote Notes"))
         parent_id (str | None): ID of parent folder in Drive (None = upload to Drive root)
+        manifest_path (Path | None): Upload manifest database (see open_upload_manifest())
+                                     None = don't use a manifest, upload everything
+        credentials: Credentials the upload threads build their own services from
+                     (None = the ones from get_drive_credentials())
 
     EXAMPLE:
         service = authenticate_drive()
@@ -259,44 +787,178 @@ def upload_directory(service, local_path: Path, parent_id: str | None = None):
         Result in Drive: Same structure exactly!
 
     IMPORTANT CONCEPTS:
-        - Recursive function: Calls itself to handle nested folders
-        - iterdir(): Gets all items (files and folders) in a directory
-        - is_dir(): Checks if an item is a folder (vs a file)
-        - This maintains the exact folder structure from your computer
-
-    RECURSION EXPLANATION:
-        When it finds a subfolder, it calls itself (upload_directory) with that subfolder.
-        This continues until all nested folders are processed.
-        Example:
-        - Upload "EverNote Notes" → creates folder
-        - Finds "Notebook1" subfolder → calls upload_directory("Notebook1")
-          - Creates "Notebook1" in Drive
-          - Finds "note1.pdf" → uploads it
-          - Done with "Notebook1"
-        - Continues with next item...
-    """
-    # Get the name of the folder we're uploading
-    # Example: Path("./EverNote Notes") → folder_name = "EverNote Notes"
-    folder_name = local_path.name
-
-    # Create a folder in Drive with this name
-    # parent_id determines where it goes (None = Drive root)
-    # Returns the new folder's ID (needed to upload files into it)
-    folder_id = create_drive_directory(service, folder_name, parent_id)
-
-    # Loop through all items in the local folder
-    # iterdir() returns both files and subfolders
-    for item in local_path.iterdir():
-        # Check if this item is a directory (folder)
-        if item.is_dir():
-            # It's a subfolder - process it recursively
-            # This calls upload_directory() again with:
-            # - The subfolder path
-            # - The parent folder ID (the folder we just created)
-            # This will create the subfolder in Drive and process its contents
-            upload_directory(service, item, folder_id)
+        - Uploads are slow because they wait on the network, not the CPU.
+          Running several at once keeps the connection busy.
+        - Drive service objects are not thread-safe, so every worker thread
+          builds its own service from the same credentials.
+        - Rate-limit and server errors are retried with exponential backoff.
+        - A file counts as unchanged when its path, size, modification time
+          and Drive folder all match the manifest.
+    """
+    manifest = open_upload_manifest(manifest_path) if manifest_path is not None else None
+
+    try:
+        # PHASE 1: Create all folders and collect the files to upload
+        tasks = []
+        create_drive_folder_tree(service, local_path, parent_id, tasks, manifest)
+
+        # Skip files that were already uploaded and haven't changed
+        if manifest is not None:
+            pending = [task for task in tasks if not _is_already_uploaded(manifest, task)]
+            if len(pending) < len(tasks):
+                logger.info(f"Skipping {len(tasks) - len(pending)} already uploaded file(s)")
         else:
-            # It's a file - upload it to the Drive folder we created
-            upload_file(service, item, folder_id)
+            pending = tasks
+
+        # Upload the biggest files first
+        # If a huge file started last, all other workers would sit idle while it
+        # finished; starting it early lets the small files fill in around it
+        pending.sort(key=lambda task: task[2], reverse=True)
+
+        logger.info(f"Uploading {len(pending)} file(s) to Google Drive")
+
+        # The credentials are shared; each worker thread builds its own service from them
+        if credentials is None:
+            credentials = get_drive_credentials()
+
+        def upload_task(index):
+            file_path, folder_id, file_size, _, mime_type = pending[index]
+
+            # While this file uploads, have the OS read the file that will be
+            # started after the ones already in progress (UPLOAD_WORKERS
+            # places further down the list), so its disk read overlaps with
+            # the network transfers
+            next_index = index + UPLOAD_WORKERS
+            if next_index < len(pending):
+                _prefetch_file(pending[next_index][0])
+
+            return upload_file(
+                _get_thread_service(credentials), file_path, folder_id, file_size, mime_type
+            )
+
+        # PHASE 2: Upload all files in parallel
+        # as_completed() gives each upload as soon as it's done (in any order),
+        # so every successful upload is recorded even if another one failed
+        errors = []
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(upload_task, index): task for index, task in enumerate(pending)
+            }
+            for future in as_completed(futures):
+                file_path, folder_id, file_size, mtime, _ = futures[future]
+                try:
+                    file_id = future.result()  # Re-raises the upload's error, if any
+                except Exception as e:
+                    logger.error(f"Failed to upload {file_path}: {e}")
+                    errors.append(e)
+                    continue
+
+                # Record each finished upload (on this thread - SQLite
+                # connections can't be shared between threads)
+                if manifest is not None:
+                    manifest.execute(
+                        "INSERT OR REPLACE INTO uploaded VALUES (?, ?, ?, ?, ?)",
+                        (os.path.abspath(file_path), mtime, file_size, folder_id, file_id),
+                    )
+
+        # All uploads have finished - now report the failures (the first
+        # error is raised, the others were logged above)
+        if errors:
+            logger.error(f"{len(errors)} of {len(pending)} file(s) failed to upload")
+            raise errors[0]
+
+        logger.info(f"✓ Uploaded {len(pending)} file(s) to Google Drive")
+    finally:
+        # Save everything recorded so far in one transaction - even if an upload
+        # failed, the files that did make it won't be uploaded again next time
+        if manifest is not None:
+            manifest.commit()
+            manifest.close()
+
+
+class BackgroundUploader:
+    """
+    Upload notebook folders in the background while other notebooks are still
+    being converted.
+
+    WHAT THIS DOES:
+    Converting notes keeps the CPU busy; uploading mostly waits on the network.
+    Instead of converting everything first and uploading afterwards, each
+    notebook folder is handed to this class as soon as it's finished, and a
+    background thread uploads it while the remaining notebooks are converted.
+
+    HOW IT WORKS:
+    1. Creating it creates (or looks up) the top folder in Drive right away,
+       so finished notebook folders can be uploaded into it
+    2. submit() queues one notebook folder; a single background thread uploads
+       the queued folders one after another with upload_directory() (which
+       itself uploads UPLOAD_WORKERS files at a time)
+    3. finish() waits for the queued uploads, then runs upload_directory() on
+       the whole top folder - thanks to the upload manifest this only uploads
+       whatever the background uploads didn't cover
+
+    EXAMPLE:
+        uploader = BackgroundUploader(authenticate_drive(), Path("./EverNote Notes"))
+        with uploader:
+            for notebook_dir in converted_notebooks():
+                uploader.submit(notebook_dir)
+        uploader.finish()
+
+    NOTE:
+        The upload manifest (upload_manifest.db) is always used here: it is
+        what connects the per-notebook uploads to the final full upload.
+        If an error ends the "with" block (for example converting a notebook
+        failed), uploads that haven't started yet are cancelled and the one
+        in progress is allowed to finish.
+    """
 
-    # After this function completes, the entire folder structure is uploaded!
+    def __init__(self, service, local_path: Path):
+        self.service = service
+        self.local_path = local_path
+
+        # Create the top folder now (unless a previous run already created it)
+        # and record it in the manifest, so the final upload_directory() call
+        # finds the same folder instead of creating a second one
+        manifest = open_upload_manifest()
+        try:
+            root_id = _known_folder_id(manifest, local_path, None)
+            if root_id is None:
+                root_id = create_drive_directory(service, local_path.name)
+                _remember_folder_id(manifest, local_path, None, root_id)
+            manifest.commit()
+        finally:
+            manifest.close()
+        self.root_id = root_id
+
+        # One thread: notebook folders are uploaded one at a time, in the order
+        # they were submitted (the Drive service object isn't thread-safe)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures = []
+
+    def submit(self, folder: Path):
+        """Queue a finished notebook folder for upload into the top Drive folder."""
+        logger.debug(f"Queued for upload: {folder.name}")
+        self._futures.append(
+            self._executor.submit(upload_directory, self.service, folder, self.root_id)
+        )
+
+    def finish(self):
+        """Wait for the queued uploads, then upload anything they didn't cover."""
+        try:
+            # result() re-raises the error of a failed upload
+            for future in self._futures:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+        upload_directory(self.service, self.local_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # After an error, don't start the queued uploads, but let the running
+        # one finish (without an error, finish() is called later and waits)
+        if exc_type is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        return False
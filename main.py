@@ -13,19 +13,61 @@ Key Concepts:
 
 # Standard library imports - these come with Python
 import argparse  # For parsing command-line arguments (like --dry-run)
-import base64  # For decoding base64-encoded file data from ENEX files
+import binascii  # For decoding base64-encoded file data from ENEX files
+import html  # For turning entities like &amp; back into characters
 import json  # For reading/writing JSON log files
 import logging  # For structured logging with different severity levels
 import mimetypes  # For guessing file extensions from MIME types
+import multiprocessing  # For choosing how the worker processes are started
 import os  # For checking if files exist
-import xml.etree.ElementTree as ET  # For parsing XML content in ENEX files
+import re  # For cleaning up note titles
+import signal  # For letting only the main process react to Ctrl+C
+from collections import deque  # For the notes an earlier run already saved, in order
+from concurrent.futures import Future, ProcessPoolExecutor  # For converting notes in parallel
+from concurrent.futures.process import BrokenProcessPool  # Raised when a worker process dies
+from contextlib import nullcontext  # For an optional "with" block (no uploader in dry runs)
+from functools import lru_cache  # For remembering extension lookups for unusual MIME types
 from pathlib import Path  # Modern way to handle file paths (better than os.path)
+from typing import NamedTuple, Optional  # For the Resource record and type hints
+
+# XML parser - use lxml if it's installed (optional, much faster C parser
+# that can stream huge files), otherwise Python's built-in ElementTree
+try:
+    from lxml import etree as ET
+
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    HAVE_LXML = False
+
+# JSON library for the extraction log - use orjson if it's installed (optional,
+# several times faster for big logs), otherwise Python's built-in json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Base64 decoder for attachments - use pybase64 if it's installed (optional,
+# uses the CPU's SIMD instructions and is several times faster on big
+# attachments), otherwise binascii's C decoder (what base64.b64decode() uses
+# internally; it reads the ASCII text directly, without a bytes copy first)
+# Both skip the line breaks Evernote puts into the encoded data
+try:
+    import pybase64
+
+    _b64decode = pybase64.b64decode
+except ImportError:
+    _b64decode = binascii.a2b_base64
 
 # Local imports - these are files in the same project
-from gdrive import authenticate_drive, upload_directory  # Functions for Google Drive integration
+from gdrive import (  # Functions for Google Drive integration
+    BackgroundUploader,  # Uploads finished notebooks while others are still processed
+    authenticate_drive,  # Logs in to Google Drive
+)
 from pdf_utils import (
     create_multi_item_pdf,  # Merges text + images/PDFs into one PDF
-    create_text_pdf,  # Converts plain text to PDF
+    create_text_pdf_fast,  # Converts plain text to PDF (for text-only notes)
     generate_unique_id,  # Creates unique 6-character IDs for notes
     should_create_multi_item_pdf,  # Decides if we need a multi-item PDF
 )
@@ -33,6 +75,131 @@ from pdf_utils import (
 # Configure logger for this module (after imports)
 logger = logging.getLogger(__name__)
 
+# Log line format: timestamp, level, message
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Parser for the note content (ENML) inside each note
+# With lxml, recover=True still extracts the text of notes whose markup is
+# slightly broken (unknown entities like &nbsp;, unclosed tags) instead of
+# failing. Built once and reused for every note.
+# None = use ElementTree's default parser
+_ENML_PARSER = ET.XMLParser(recover=True, huge_tree=True) if HAVE_LXML else None
+
+# Parser for the notes sent to the worker processes as XML text
+# (huge_tree=True: allow very large text nodes - big base64 attachments)
+_NOTE_PARSER = ET.XMLParser(huge_tree=True) if HAVE_LXML else None
+
+# File extensions for the attachment types Evernote exports most often
+# Looking these up in a dictionary is much faster than asking mimetypes every time
+_MIME_EXT = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/bmp": ".bmp",
+    "application/pdf": ".pdf",
+    "video/mp4": ".mp4",
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "application/zip": ".zip",
+    "application/octet-stream": ".bin",
+}
+
+# Characters that can't be used in file names on Windows, macOS or Linux
+# (plus invisible control characters) - each is replaced with "-"
+_TITLE_TRANS = str.maketrans(dict.fromkeys('/\\:*?"<>|' + "".join(map(chr, range(32))), "-"))
+
+# Two or more dashes in a row (collapsed into one)
+_DASH_RE = re.compile(r"-{2,}")
+
+# Note content that is just plain text inside <en-note> - no other tags and no
+# entities like &amp; - so the text can be taken as-is without an XML parser
+# Example: <?xml ...?><!DOCTYPE en-note ...><en-note>Buy milk</en-note>
+_PLAIN_ENML_RE = re.compile(
+    r"\s*(?:<\?xml[^>]*\?>\s*)?(?:<!DOCTYPE[^>]*>\s*)?<en-note[^>]*>([^<&]*)</en-note>\s*"
+)
+
+# Any XML tag (used to salvage text from content the parser can't read)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+# The ID at the start of an output file name, e.g. "A3B9K2" in "A3B9K2 - Title.pdf"
+_ID_PREFIX_RE = re.compile(r"([A-Z0-9]{6}) - ")
+
+# Log entry types written once per successfully saved note
+# ("unsupported-separate-file" entries belong to the multi-item PDF before them)
+_SAVED_NOTE_TYPES = frozenset({"multi-item-pdf", "single-resource", "text-only-pdf"})
+
+# Attachments saved as-is are decoded this many base64 characters at a time
+# (see _decode_base64_chunks())
+B64_CHUNK_CHARS = 4 * 1024 * 1024  # 4 MB of text → 3 MB of data
+
+# Whitespace that can appear inside base64 data (line breaks), removed per piece
+_B64_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+# Extra os.open() flag for binary files: on Windows, a file opened without
+# O_BINARY is in text mode, where every "\n" byte written becomes "\r\n"
+# (which corrupts images, PDFs, ...). Other systems don't have the flag.
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# How many notes per worker process can be read ahead of the conversion
+# (more keeps the workers busy, but every waiting note is held in memory)
+PENDING_NOTES_PER_WORKER = 4
+
+# Note IDs handed out so far (or found in the output folders)
+# IDs are only handed out by the main process (see process_enex_file())
+_USED_IDS: set[str] = set()
+
+
+def _json_dumps(data, pretty: bool = False) -> bytes:
+    """
+    Convert data to JSON (as UTF-8 bytes), using orjson when it's available.
+
+    pretty=True spreads the JSON over several lines with 2-space indentation;
+    otherwise everything goes on one line (used for JSON Lines).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None).encode("utf-8")
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, using orjson when it's available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=256)
+def _ext_for(mime_type: str) -> str:
+    """
+    Get the file extension for a MIME type (e.g. "image/jpeg" → ".jpg").
+
+    Common types come from _MIME_EXT; anything else is looked up with mimetypes.
+    The answer is cached, so a notebook full of the same unusual type (say
+    "image/heic") only asks mimetypes once per worker.
+    Returns "" if the type is unknown.
+    """
+    return _MIME_EXT.get(mime_type) or mimetypes.guess_extension(mime_type, strict=True) or ""
+
+
+def _unique_id() -> str:
+    """
+    Generate a note ID that hasn't been used yet.
+
+    generate_unique_id() is random, so with many thousands of notes two of them
+    can (rarely) get the same ID. Checking a set in memory catches that before
+    any file is created, so get_unique_filepath() never has to rename.
+    """
+    while True:
+        note_id = generate_unique_id()
+        if note_id not in _USED_IDS:
+            _USED_IDS.add(note_id)
+            return note_id
+
 
 def load_extraction_log(log_file: Path) -> dict:
     """
@@ -70,15 +237,224 @@ def load_extraction_log(log_file: Path) -> dict:
 
     # Try to read and parse the JSON file
     try:
-        # json.loads() converts a JSON string into a Python dictionary
-        # read_text() reads the entire file as a string
-        return json.loads(log_file.read_text())
+        # _json_loads() converts JSON into a Python dictionary
+        # read_bytes() reads the entire file without decoding it to a string
+        # first (the JSON parser handles the UTF-8 bytes directly)
+        return _json_loads(log_file.read_bytes())
     except Exception:
         # If anything goes wrong (corrupted file, invalid JSON, etc.),
         # return an empty dictionary instead of crashing
         return {}
 
 
+class LogWriter:
+    """
+    Append log entries to a JSON Lines file while notes are being processed.
+
+    WHAT THIS DOES:
+    Every entry becomes one line of JSON in the file. Lines are collected in a
+    1 MB buffer and written out every FLUSH_EVERY entries (and when the writer
+    is closed), so logging thousands of notes costs only a few disk writes.
+
+    If the run is interrupted, the lines written so far survive and are
+    picked up by the next run (see recover_log_journal()).
+
+    EXAMPLE:
+        writer = LogWriter(Path("./extraction_log.jsonl"))
+        writer.append({"note": "My Note", "success": True, "notebook": "Work"})
+        writer.close()
+        # extraction_log.jsonl now ends with:
+        # {"note": "My Note", "success": true, "notebook": "Work"}
+
+    NOTE:
+        The file is opened in append mode, so entries already in it (from
+        an interrupted run that wasn't recovered yet) are kept.
+    """
+
+    # How many entries are buffered before they are written to disk
+    FLUSH_EVERY = 256
+
+    def __init__(self, path: Path):
+        self._file = open(path, "ab", buffering=1024 * 1024)
+        self._unflushed = 0
+
+    def append(self, entry: dict):
+        """Add one log entry (written to disk at the next flush)."""
+        self._file.write(_json_dumps(entry) + b"\n")
+        self._unflushed += 1
+        if self._unflushed >= self.FLUSH_EVERY:
+            self._file.flush()
+            self._unflushed = 0
+
+    def extend(self, entries: list):
+        """Add several log entries."""
+        for entry in entries:
+            self.append(entry)
+
+    def close(self):
+        """Write any buffered entries and close the file."""
+        self._file.close()
+
+
+def _merge_logs(logs_json: dict, new_logs: dict):
+    """
+    Merge one batch of logs into the overall logs dictionary.
+
+    A notebook's entries replace any older entries for that notebook
+    (it was processed again); warnings are added to the existing ones.
+    """
+    for key, entries in new_logs.items():
+        if key == "warnings":
+            logs_json.setdefault("warnings", []).extend(entries)
+        else:
+            logs_json[key] = entries
+
+
+def _merge_recovered_entries(previous: list, recovered: list) -> list:
+    """
+    Merge a notebook's journal entries into its entries from an earlier run.
+
+    WHAT THIS DOES:
+    An interrupted run may have processed only part of a notebook, so its
+    journal entries can't simply replace the notebook's older entries - the
+    notes it didn't get to would be forgotten (and converted again, with new
+    IDs, by the next run). Instead, only the entries the journal has newer
+    versions of are replaced:
+    - An entry for a saved file is replaced by the journal's entry for the
+      same file, in the same place (so a note's entries stay together and
+      notes with the same title keep their order)
+    - An old entry without a file (a failed note) is dropped if the journal
+      has anything for the same note
+    Everything else in the journal is added at the end.
+
+    Args:
+        previous (list): The notebook's entries in extraction_log.json
+        recovered (list): The notebook's entries from the journal, in order
+
+    Returns:
+        list: The merged entries
+
+    EXAMPLE:
+        _merge_recovered_entries([A, B, C], [A])  # → [A, B, C]
+        _merge_recovered_entries([A, B], [A, D])  # → [A, B, D]
+    """
+    by_path = {entry["file_path"]: entry for entry in recovered if "file_path" in entry}
+    recovered_notes = {(entry.get("file"), entry.get("note")) for entry in recovered}
+
+    merged = []
+    used = set()  # ids of the journal entries that took the place of an old entry
+    for entry in previous:
+        file_path = entry.get("file_path")
+        if file_path is not None:
+            newer = by_path.get(file_path)
+            if newer is None:
+                merged.append(entry)  # Not in the journal - keep it
+            elif id(newer) not in used:
+                merged.append(newer)
+                used.add(id(newer))
+        elif (entry.get("file"), entry.get("note")) not in recovered_notes:
+            merged.append(entry)
+
+    merged.extend(entry for entry in recovered if id(entry) not in used)
+    return merged
+
+
+def recover_log_journal(logs_json: dict, journal_file: Path) -> int:
+    """
+    Add the entries of an interrupted run's JSON Lines journal to the logs.
+
+    WHAT THIS DOES:
+    While notes are processed, every log entry is also appended to the
+    journal (see LogWriter). A run that finishes normally deletes it, so if
+    the journal still exists, the previous run stopped early. Its entries
+    are merged into logs_json so that run's work isn't forgotten.
+
+    Args:
+        logs_json (dict): Logs loaded by load_extraction_log() - updated in place
+        journal_file (Path): Path to the journal (e.g., "./extraction_log.jsonl")
+
+    Returns:
+        int: How many entries were recovered (0 if there was no journal)
+    """
+    if not journal_file.exists():
+        return 0
+
+    recovered = {}
+    count = 0
+    with open(journal_file, "rb") as journal:
+        for line in journal:
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                continue  # Half-written last line from the interruption - skip it
+
+            # Collision warnings go to "warnings", everything else to its notebook
+            if entry.get("type") == "filename-collision":
+                recovered.setdefault("warnings", []).append(entry)
+            else:
+                recovered.setdefault(entry.get("notebook", "unknown"), []).append(entry)
+            count += 1
+
+    # Only part of a notebook may be in the journal, so its entries are merged
+    # into the earlier ones instead of replacing them (unlike _merge_logs())
+    for key, entries in recovered.items():
+        if key == "warnings":
+            logs_json.setdefault("warnings", []).extend(entries)
+        else:
+            logs_json[key] = _merge_recovered_entries(logs_json.get(key, []), entries)
+    return count
+
+
+def _index_done_notes(entries: list, note_dir: Path) -> dict:
+    """
+    Find the notes of a notebook that an earlier run already saved.
+
+    WHAT THIS DOES:
+    Groups a notebook's previous log entries by note: each successful
+    multi-item PDF, single resource or text-only PDF, together with the
+    unsupported files saved next to it. A note only counts as done if all of
+    its files are still in this notebook's output folder.
+
+    Args:
+        entries (list): The notebook's entries from extraction_log.json
+        note_dir (Path): The notebook's output folder in this run
+
+    Returns:
+        dict: safe title → deque of entry lists, one list per saved note, in
+              the order the notes were saved (several notes can share a title)
+
+    EXAMPLE:
+        done = _index_done_notes(logs_json["Work"], Path("./EverNote Notes/Work"))
+        # {"Meeting Notes": deque([[{...multi-item-pdf...}, {...unsupported...}]])}
+    """
+    groups = []
+    group = None
+    for entry in entries:
+        entry_type = entry.get("type")
+        if entry.get("success") and entry_type in _SAVED_NOTE_TYPES:
+            group = [entry]
+            groups.append(group)
+        elif (
+            entry_type == "unsupported-separate-file"
+            and group is not None
+            and entry.get("note") == group[0].get("note")
+        ):
+            group.append(entry)
+        else:
+            group = None
+
+    done = {}
+    for group in groups:
+        # Files written into another output folder don't count
+        if all(
+            Path(entry.get("file_path", "")).parent == note_dir
+            and os.path.exists(entry["file_path"])
+            for entry in group
+        ):
+            done.setdefault(group[0].get("note"), deque()).append(group)
+    return done
+
+
 def list_enex_files(input_dir: Path) -> list[Path]:
     """
     List all .enex files in the input directory.
@@ -87,10 +463,10 @@ def list_enex_files(input_dir: Path) -> list[Path]:
     Scans a directory and finds all files ending in .enex (Evernote export files).
 
     HOW IT WORKS:
-    1. Uses iterdir() to get all files/folders in the directory
-    2. Checks each item's suffix (file extension)
-    3. Converts to lowercase for case-insensitive matching (.ENEX = .enex)
-    4. Returns only files that match ".enex"
+    1. Uses os.scandir() to read the directory entries
+    2. Skips anything that isn't a regular file (a folder named "x.enex" is ignored)
+    3. Lowercases each name for case-insensitive matching (.ENEX = .enex)
+    4. Builds a Path only for the names that match ".enex"
 
     Args:
         input_dir (Path): The directory to search in (e.g., Path("./input_data"))
@@ -104,18 +480,127 @@ def list_enex_files(input_dir: Path) -> list[Path]:
         # files might be: [Path("./input_data/Notebook1.enex"), Path("./input_data/Notebook2.enex")]
 
     NOTE:
-        This uses a "list comprehension" - a concise Python way to filter items.
-        Equivalent longer code:
-            files = []
-            for f in input_dir.iterdir():
-                if f.suffix.lower() == ".enex":
-                    files.append(f)
-            return files
+        os.scandir() is what iterdir() uses under the hood, but iterdir() wraps
+        every entry in a Path object first. Going to scandir directly means
+        unrelated files (backups, archives, ...) never become Path objects, and
+        entry.is_file() usually answers from the directory listing itself
+        without an extra stat() call.
+    """
+    with os.scandir(input_dir) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.lower().endswith(".enex") and entry.is_file()
+        ]
+
+
+def _out_path(note_dir: Path, note_id: str, safe_title: str, tail: str) -> Path:
+    """
+    Build the output path for a note's file.
+
+    Every handler names its files the same way:
+    - With serial:    "A3B9K2 - Meeting Notes{tail}"
+    - Without serial: "Meeting Notes{tail}"
+
+    Args:
+        note_dir (Path): The notebook's output directory
+        note_id (str): Unique note ID, or "" when --no-serial is used
+        safe_title (str): Note title safe for filesystem
+        tail (str): Rest of the file name, e.g. ".pdf" or "-MultiItem.pdf"
+
+    Returns:
+        Path: note_dir / file name
+    """
+    name = f"{note_id} - {safe_title}{tail}" if note_id else f"{safe_title}{tail}"
+    return note_dir / name
+
+
+def _reserve_path(path: Path) -> bool:
+    """
+    Claim a file name by creating an empty file there - but only if nothing exists yet.
+
+    O_EXCL makes "check if it exists" and "create it" one step, so two notes
+    can never end up with the same file even if they're saved at the same time.
+
+    Returns:
+        bool: True if the file was created, False if the name was already taken
+    """
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | _O_BINARY, 0o666))
+    except FileExistsError:
+        return False
+    return True
+
+
+def _write_reserved(path: Path, chunks) -> None:
+    """
+    Write data into a file whose name was reserved by get_unique_filepath().
+
+    Args:
+        path (Path): The reserved (empty) file
+        chunks: The data to write, as an iterable of bytes objects - e.g.
+                [data] for data that's already in memory, or the pieces
+                produced by _decode_base64_chunks()
+
+    The bytes go straight to the file descriptor with os.write(): for data
+    that's already in memory, the buffered file object that open() /
+    write_bytes() would set up only adds overhead.
+    There's no O_CREAT - if the reserved file has disappeared, this fails
+    instead of quietly creating it again.
+    """
+    # _O_BINARY: write the bytes exactly as they are, also on Windows
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC | _O_BINARY)
+    try:
+        for chunk in chunks:
+            # os.write() may write less than it was given (e.g. for very large
+            # data), so keep going until everything is written
+            # memoryview slices don't copy the data
+            remaining = memoryview(chunk)
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
+
+
+def _decode_base64_chunks(text: str):
+    """
+    Decode base64 text piece by piece.
+
+    WHAT THIS DOES:
+    Decoding a whole attachment at once needs a second, decoded copy of it in
+    memory - for a big video that's hundreds of MB. Decoding B64_CHUNK_CHARS
+    characters at a time and writing each piece out right away keeps the
+    extra memory to one piece, whatever the attachment's size.
+
+    HOW IT WORKS:
+    Base64 turns every 4 characters into 3 bytes, so each piece can only
+    decode a multiple of 4 characters. Line breaks are removed from the piece
+    first (they don't count), and the 0-3 characters left over are carried
+    into the next piece.
+
+    Yields:
+        bytes: The decoded data, one piece at a time
+
+    EXAMPLE:
+        _write_reserved(file_path, _decode_base64_chunks(resource.data))
     """
-    # List comprehension: create a list by iterating and filtering
-    # f.suffix gets the file extension (e.g., ".enex", ".txt")
-    # .lower() makes it case-insensitive (".ENEX" becomes ".enex")
-    return [f for f in input_dir.iterdir() if f.suffix.lower() == ".enex"]
+    # Small attachments (almost all of them): decode in one go
+    if len(text) <= B64_CHUNK_CHARS:
+        yield _b64decode(text)
+        return
+
+    carry = ""
+    for start in range(0, len(text), B64_CHUNK_CHARS):
+        piece = carry + text[start:start + B64_CHUNK_CHARS].translate(_B64_WHITESPACE)
+        usable = len(piece) - len(piece) % 4
+        carry = piece[usable:]
+        if usable:
+            yield _b64decode(piece[:usable])
+
+    # Characters left over at the very end mean the data is incomplete - the
+    # decoder raises the same error as it would for the whole text
+    if carry:
+        yield _b64decode(carry)
 
 
 def get_unique_filepath(base_path: Path, logs: dict) -> Path:
@@ -131,14 +616,20 @@ def get_unique_filepath(base_path: Path, logs: dict) -> Path:
 
     Returns:
         Path: A unique file path (e.g., "My Note.pdf" or "My Note_1.pdf" or "My Note_2.pdf")
+              An empty file is created there to reserve the name - the caller
+              overwrites it (or deletes it if saving fails)
 
     Example:
         If "Vacation.pdf" exists:
         - First call: Returns "Vacation.pdf"
         - Second call: Returns "Vacation_1.pdf" (logs warning)
         - Third call: Returns "Vacation_2.pdf" (logs warning)
+
+    NOTE:
+        Instead of trying "_1", "_2", "_3", ... one at a time (one disk check each),
+        the folder is listed once to find the highest number already used.
     """
-    if not base_path.exists():
+    if _reserve_path(base_path):
         return base_path
 
     # File exists - need to find a unique name
@@ -146,10 +637,21 @@ def get_unique_filepath(base_path: Path, logs: dict) -> Path:
     suffix = base_path.suffix  # Extension (e.g., ".pdf")
     parent = base_path.parent  # Directory
 
-    counter = 1
+    # Find the highest counter in use, e.g. "My Note_3.pdf" → 3
+    prefix = f"{stem}_"
+    counter = 0
+    with os.scandir(parent) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                number = name[len(prefix):len(name) - len(suffix)]
+                if number.isdigit():
+                    counter = max(counter, int(number))
+
     while True:
+        counter += 1
         new_path = parent / f"{stem}_{counter}{suffix}"
-        if not new_path.exists():
+        if _reserve_path(new_path):
             # Log collision warning
             warning_msg = f"File collision: '{base_path.name}' already exists, using '{new_path.name}'"
             logger.warning(f"⚠️  {warning_msg}")
@@ -160,89 +662,309 @@ def get_unique_filepath(base_path: Path, logs: dict) -> Path:
                 "message": warning_msg
             })
             return new_path
-        counter += 1
 
 
-def process_enex_file(file: Path, output_dir: Path, logs: dict, preserve_filenames: bool = False):
+def _iter_notes(file: Path):
     """
-    Process a single ENEX file and extract its notes.
+    Yield the <note> elements of an ENEX file one at a time.
+
+    WHAT THIS DOES:
+    The file is streamed: each note is parsed, handed to the caller, and
+    then thrown away before the next one is read. Only one note (with its
+    attachments) is in memory at a time, even for ENEX files that are
+    hundreds of MB.
+
+    lxml is used if it's installed (faster, and tolerates minor XML errors);
+    otherwise Python's built-in ElementTree does the same job.
+
+    Args:
+        file (Path): Path to the ENEX file
+
+    Yields:
+        Element: One <note> element at a time
+    """
+    if not HAVE_LXML:
+        # iterparse() reports each element once its start/closing tag has been read
+        context = ET.iterparse(file, events=("start", "end"))
+
+        # The first event is the start of the root element (<en-export>)
+        _, root = next(context)
+        for event, element in context:
+            if event == "end" and element.tag == "note":
+                yield element
+
+                # The caller is done with this note - remove it (and its
+                # attachments) from the root so its memory can be freed
+                root.clear()
+        return
+
+    # iterparse() reports each <note> once its closing tag has been read
+    # huge_tree=True: allow very large text nodes (big base64 attachments)
+    # recover=True: keep going past minor XML errors instead of giving up
+    context = ET.iterparse(str(file), events=("end",), tag="note", huge_tree=True, recover=True)
+    for _, note in context:
+        yield note
+
+        # The caller is done with this note - free its memory, and drop the
+        # already-processed notes that are still attached to the root element
+        note.clear()
+        while note.getprevious() is not None:
+            del note.getparent()[0]
+
+
+def process_enex_file(
+    file: Path,
+    output_dir: Path,
+    submit,
+    preserve_filenames: bool = False,
+    previous_entries: Optional[list] = None,
+):
+    """
+    Read a single ENEX file and hand its notes to worker processes for conversion.
 
     WHAT THIS DOES:
     Opens an ENEX file (which is XML format), parses it, finds all notes inside,
-    and processes each note one by one. Think of it as opening a notebook and
-    going through each page.
+    and sends each note off to be converted. Think of it as opening a notebook and
+    handing out its pages, one at a time, to several people working in parallel.
 
     HOW IT WORKS:
     1. Gets the notebook name from the filename (without .enex extension)
-    2. Creates an empty list in logs for this notebook
-    3. Parses the XML file to extract all <note> elements
-    4. Loops through each note and processes it
-    5. If anything goes wrong, logs the error and stops
+    2. Reads the <note> elements from the XML file one at a time
+    3. For each note with a title:
+       - if an earlier run already saved it, yields that run's log entries
+       - otherwise gives it an ID and submits it for conversion (see _convert_note())
+    4. If the XML can't be read, yields the error and stops
 
     Args:
         file (Path): Path to the ENEX file to process (e.g., Path("./input_data/MyNotebook.enex"))
         output_dir (Path): Where to save the extracted notes (e.g., Path("./EverNote Notes"))
-        logs (dict): Dictionary that accumulates processing results for logging
+        submit: Function that starts a job in a worker process and returns its
+                Future (executor.submit of a ProcessPoolExecutor)
         preserve_filenames (bool): If True, skip serial number prefix on filenames (default: False)
+        previous_entries (Optional[list]): This notebook's entries from an earlier run's
+                                           extraction log; notes saved by that run are
+                                           skipped (None = process every note)
+
+    Yields:
+        Future | dict: One item per note, in the order of the file - either the
+                       Future of the worker converting it, or (for notes that need
+                       no converting) its logs right away, e.g. {"MyNotebook": [...]}
+                       Both end up as the same kind of logs dictionary.
 
     EXAMPLE:
-        file = Path("./input_data/WorkNotes.enex")
-        output_dir = Path("./EverNote Notes")
-        logs = {}
-        process_enex_file(file, output_dir, logs, preserve_filenames=False)
-        # This will create "./EverNote Notes/WorkNotes/" and process all notes in the file
+        with ProcessPoolExecutor() as executor:
+            for item in process_enex_file(file, Path("./EverNote Notes"), executor.submit):
+                note_logs = item if isinstance(item, dict) else item.result()
 
     NOTE:
         file.stem gives the filename without extension
         "MyNotebook.enex" → stem = "MyNotebook"
+
+        The ID and the "already saved" check happen here, in the main process,
+        because both depend on the notes that came before; everything else
+        about a note is independent of the other notes and runs in parallel.
     """
+    logger.info(f"Processing: {file.name}")
+
     # Get notebook name from filename (remove .enex extension)
     # Example: "MyNotebook.enex" → notebook_name = "MyNotebook"
     notebook_name = file.stem
 
-    # Initialize an empty list in logs dictionary for this notebook
-    # This will store information about each processed note
-    logs[notebook_name] = []
+    # Create the output directory for this notebook (once, not for every note)
+    # Example: output_dir / "MyNotebook" → "./EverNote Notes/MyNotebook"
+    # mkdir(parents=True) creates parent directories if they don't exist
+    # exist_ok=True means don't error if directory already exists
+    note_dir = output_dir / notebook_name
+    note_dir.mkdir(parents=True, exist_ok=True)
 
-    # Try to parse the XML file - ENEX files are XML format
-    try:
-        # ET.parse() reads and parses the XML file into a tree structure
-        tree = ET.parse(file)
+    # Don't hand out IDs that files from an earlier run already use
+    if not preserve_filenames:
+        with os.scandir(note_dir) as entries:
+            _USED_IDS.update(
+                match.group(1) for entry in entries if (match := _ID_PREFIX_RE.match(entry.name))
+            )
 
-        # getroot() gets the root element, findall("note") finds all <note> tags
-        # Each <note> tag represents one note from Evernote
-        notes = tree.getroot().findall("note")
-    except Exception as e:
-        # If parsing fails (corrupted file, invalid XML, etc.), log the error
-        logs[notebook_name].append({
-            "file": file.name,        # Just the filename, not full path
-            "error": str(e),          # Convert exception to string
-            "notebook": notebook_name
-        })
-        return  # Stop processing this file
+    # Notes an earlier run already saved (and whose files are still there)
+    done = _index_done_notes(previous_entries, note_dir) if previous_entries else None
+
+    # Parse the XML file (ENEX files are XML format) and process each note
+    # Each <note> tag represents one note from Evernote
+    notes = _iter_notes(file)
+    while True:
+        try:
+            note = next(notes, None)
+        except Exception as e:
+            # If parsing fails (corrupted file, invalid XML, etc.), log the error
+            yield {notebook_name: [{
+                "file": file.name,        # Just the filename, not full path
+                "error": str(e),          # Convert exception to string
+                "notebook": notebook_name
+            }]}
+            return  # Stop processing this file
+
+        if note is None:
+            return  # No more notes in this file
+
+        # If there's no title, skip this note (can't create a file without a name)
+        title = note.findtext("title")
+        if not title:
+            continue
+
+        safe_title = make_safe_title(title)
+
+        # If an earlier run already saved this note, keep its log entries
+        # (notes with the same title are matched up in the order they appear)
+        saved = done.get(safe_title) if done else None
+        if saved:
+            logger.debug(f"Already saved by an earlier run, skipping: {safe_title}")
+            yield {notebook_name: saved.popleft()}
+            continue
+
+        # Generate a unique 6-character ID for this note (unless preserve_filenames is True)
+        # Example: "A3B9K2" - helps prevent filename conflicts
+        # If preserve_filenames is True, use empty string (no prefix)
+        note_id = "" if preserve_filenames else _unique_id()
+
+        # XML elements can't be sent to another process, so the note goes as
+        # XML text (tostring() runs before _iter_notes() frees the note)
+        yield submit(
+            _convert_note, ET.tostring(note), notebook_name, file, note_dir, note_id, safe_title
+        )
+
+
+def _worker_context():
+    """
+    Choose how process_files() starts its worker processes.
+
+    The default on Linux, "fork", copies the main process as it is at that
+    moment. The pool starts workers whenever it needs them, while the
+    background upload threads may be holding locks (in logging, SSL, ...) -
+    a forked copy would hold those locks forever and hang. "forkserver"
+    forks workers from a small separate process that has no such threads.
+    It doesn't exist on Windows, which (like macOS) already uses "spawn".
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_worker(log_level: int):
+    """
+    Set up logging in a worker process started by process_files().
+
+    Workers don't share the main process's logging setup (they are started
+    fresh, see _worker_context()), so it's configured again here.
+
+    Ctrl+C is ignored in the workers: it's sent to every process of the
+    program, and a worker stopped in the middle of a note would leave a
+    half-written file behind. The main process handles it instead, and lets
+    the notes that are being converted finish (see process_files()).
+    """
+    logging.basicConfig(level=log_level, format=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _convert_note(note_xml: bytes, notebook_name, file, note_dir, note_id, safe_title) -> dict:
+    """
+    Convert one note in a worker process (submitted by process_enex_file()).
 
-    # Process each note in the ENEX file
-    # This loops through all the <note> elements we found
-    for note in notes:
-        process_note(note, notebook_name, file, output_dir, logs, preserve_filenames)
+    Args:
+        note_xml (bytes): The <note> element as XML text
+        (the other arguments are passed on to process_note())
+
+    Returns:
+        dict: The note's logs, e.g. {"MyNotebook": [...], "warnings": [...]}
+              ("warnings" only if there were any)
+    """
+    logs = {notebook_name: []}
+    process_note(
+        ET.fromstring(note_xml, _NOTE_PARSER), notebook_name, file, note_dir, logs,
+        note_id, safe_title
+    )
+    return logs
+
+
+def make_safe_title(title: str) -> str:
+    """
+    Make a note title safe for use in file names.
+
+    Characters like "/", ":" or "?" are not allowed in filenames on some
+    systems, so each is replaced with "-" (one pass, see _TITLE_TRANS).
+    "--" (or longer) is collapsed into "-" to avoid double dashes, and
+    spaces, dots and dashes are trimmed from the ends.
+    A title made only of such characters becomes "untitled".
+
+    EXAMPLE:
+        make_safe_title("Q1/Q2: Plans?")  # → "Q1-Q2- Plans"
+    """
+    return _DASH_RE.sub("-", title.translate(_TITLE_TRANS)).strip(" .-") or "untitled"
 
 
-def process_note(note, notebook_name, file, output_dir, logs, preserve_filenames=False):
+def _extract_note_text(content: str) -> Optional[str]:
+    """
+    Get the plain text of a note's <content> (Evernote's XHTML, called ENML).
+
+    HOW IT WORKS:
+    1. Fast path: content that is just text inside <en-note> (no other tags,
+       no entities) - very common for simple notes - is used as-is, without
+       running the XML parser at all
+    2. Otherwise the content is parsed and the text of every element is
+       collected with itertext(), one block per line
+    3. If the content isn't valid XML (only possible without lxml, which
+       recovers from broken markup), the tags are cut out with a regular
+       expression so the text is still kept
+
+    Args:
+        content (str): The text of the note's <content> element
+
+    Returns:
+        Optional[str]: The note's text, or None if it has no text at all
+                       (only whitespace counts as no text)
+
+    EXAMPLE:
+        _extract_note_text("<en-note><div>Hello</div><div>World</div></en-note>")
+        # Returns "Hello\nWorld"
+    """
+    plain = _PLAIN_ENML_RE.fullmatch(content)
+    if plain:
+        return plain.group(1).strip() or None
+
+    try:
+        # Parse the content XML to extract plain text
+        # strip() removes leading/trailing whitespace
+        # (passed as bytes: lxml refuses text that has an encoding declaration)
+        content_root = ET.fromstring(content.strip().encode("utf-8"), _ENML_PARSER)
+    except ET.ParseError:
+        # Not valid XML - replace every tag with a line break instead, and turn
+        # entities like &amp; back into characters
+        # The prolog (<?xml ...?> and <!DOCTYPE ...>) is removed along with the tags
+        parts = html.unescape(_TAG_RE.sub("\n", content)).splitlines()
+    else:
+        # A recovering parser returns None if nothing at all could be read
+        if content_root is None:
+            return None
+        # itertext() gets all text from all XML elements
+        parts = content_root.itertext()
+
+    # Pieces that are only whitespace (the line breaks between tags) are
+    # dropped, so a note with just empty <div>s doesn't count as text
+    # join with "\n" puts each text block on a new line
+    return "\n".join(t for t in parts if t and not t.isspace()).strip() or None
+
+
+def process_note(note, notebook_name, file, note_dir, logs, note_id, safe_title):
     """
     Process a single note: extract text and resources, create PDFs with unique IDs.
 
     WHAT THIS DOES:
-    Takes one note from the ENEX file, extracts its title, text content, and attachments,
+    Takes one note from the ENEX file, extracts its text content and attachments,
     then decides how to save it based on what it contains. This is the "brain" function
     that routes notes to the right handler based on their content.
 
     HOW IT WORKS:
-    1. Extracts the note's title (required - skip note if missing)
-    2. Generates a unique ID for the note
-    3. Extracts text content (if any)
-    4. Finds all resources/attachments (images, PDFs, etc.)
-    5. Creates the output directory for this notebook
-    6. Decides which handler function to call based on content:
+    1. Extracts text content (if any)
+    2. Finds all resources/attachments (images, PDFs, etc.)
+    3. Decides which handler function to call based on content:
        - Multi-item: text + multiple resources OR text + 1+ resources
        - Single resource: just one attachment, no text
        - Text-only: just text, no attachments
@@ -251,8 +973,10 @@ def process_note(note, notebook_name, file, output_dir, logs, preserve_filenames
         note (Element): XML element representing one note from the ENEX file
         notebook_name (str): Name of the notebook this note belongs to
         file (Path): Path to the source ENEX file (for logging)
-        output_dir (Path): Base directory where all notebooks will be saved
+        note_dir (Path): This notebook's output directory (created by process_enex_file())
         logs (dict): Dictionary to log processing results
+        note_id (str): Unique ID like "A3B9K2" ("" when preserving filenames)
+        safe_title (str): The note's title, safe for file names (see make_safe_title())
 
     EXAMPLE:
         A note might contain:
@@ -266,54 +990,25 @@ def process_note(note, notebook_name, file, output_dir, logs, preserve_filenames
         - note_id: Unique identifier to prevent filename conflicts
         - resources: Attachments like images, PDFs, videos, etc.
     """
-    # Extract the note's title from the XML
-    # findtext() searches for a tag and returns its text content
-    title = note.findtext("title")
-
-    # If there's no title, skip this note (can't create a file without a name)
-    if not title:
-        return  # Exit early - nothing to process
-
-    # Generate a unique 6-character ID for this note (unless preserve_filenames is True)
-    # Example: "A3B9K2" - helps prevent filename conflicts
-    # If preserve_filenames is True, use empty string (no prefix)
-    note_id = "" if preserve_filenames else generate_unique_id()
-
-    # Make the title safe for filesystem use
-    # "/" is not allowed in filenames on most systems, so replace with "-"
-    # Replace "--" with "-" to avoid double dashes
-    safe_title = title.replace("/", "-").replace("--", "-")
-
-    # Find all resource elements in the note
-    # Resources are attachments like images, PDFs, videos, etc.
-    resources = note.findall("resource")
-
-    # Find the content element which contains the note's text
-    content_element = note.find("content")
-    text_content = None  # Will store extracted text if available
-
-    # Try to extract text from the content element
-    # The content is stored as XML/HTML-like text, so we need to parse it
+    # Collect the parts of the note we need in a single pass over its children:
+    # - content: the element which contains the note's text
+    # - resource: attachments like images, PDFs, videos, etc. (can be several)
+    content_element = None
+    resource_elements = []
+    for child in note:
+        tag = child.tag
+        if tag == "content":
+            content_element = child
+        elif tag == "resource":
+            resource_elements.append(child)
+
+    # Read every attachment's data, MIME type and extension once
+    resources = _parse_resources(resource_elements)
+
+    # Extract the note's plain text (None if it has none)
+    text_content = None
     if content_element is not None and content_element.text is not None:
-        try:
-            # Parse the content XML to extract plain text
-            # strip() removes leading/trailing whitespace
-            content_root = ET.fromstring(content_element.text.strip())
-
-            # itertext() gets all text from all XML elements
-            # join with "\n" puts each text block on a new line
-            text_content = "\n".join(content_root.itertext()).strip()
-        except ET.ParseError:
-            # If the content isn't valid XML, just skip text extraction
-            # The note might still have resources to process
-            pass
-
-    # Create the output directory for this notebook
-    # Example: output_dir / "MyNotebook" → "./EverNote Notes/MyNotebook"
-    # mkdir(parents=True) creates parent directories if they don't exist
-    # exist_ok=True means don't error if directory already exists
-    note_dir = output_dir / notebook_name
-    note_dir.mkdir(parents=True, exist_ok=True)
+        text_content = _extract_note_text(content_element.text)
 
     # Decide how to handle this note based on its content
     # should_create_multi_item_pdf() checks if we have multiple items to combine
@@ -341,6 +1036,47 @@ def process_note(note, notebook_name, file, output_dir, logs, preserve_filenames
         # Note: If note has neither text nor resources, nothing happens
 
 
+class Resource(NamedTuple):
+    """
+    One attachment of a note, read from its <resource> element.
+
+    Fields are None when the ENEX file leaves them out; the handlers check
+    for that and log an error instead of saving the attachment.
+    """
+
+    data: Optional[str]  # The file's contents, base64-encoded (as stored in the ENEX file)
+    mime: Optional[str]  # MIME type, e.g. "image/jpeg"
+    extension: str  # File extension for the MIME type, e.g. ".jpg" ("" if unknown)
+
+
+def _parse_resources(resource_elements) -> list[Resource]:
+    """
+    Read each <resource> element once into a Resource record.
+
+    WHAT THIS DOES:
+    Collects the data and MIME type of every attachment in a single pass over
+    each element's children, so the handlers below can use them directly
+    instead of searching the XML again.
+
+    Args:
+        resource_elements (list): The note's <resource> XML elements
+
+    Returns:
+        list[Resource]: One record per element, in the same order
+    """
+    parsed = []
+    for resource in resource_elements:
+        data = mime = None
+        for child in resource:
+            tag = child.tag
+            if tag == "data":
+                data = child.text
+            elif tag == "mime":
+                mime = child.text
+        parsed.append(Resource(data, mime, _ext_for(mime) if mime else ""))
+    return parsed
+
+
 def handle_multi_item_note(
     note_id, safe_title, text_content, resources,
     note_dir, file, notebook_name, logs
@@ -354,17 +1090,15 @@ def handle_multi_item_note(
     Unsupported files (videos, ZIP files, etc.) are saved separately.
 
     HOW IT WORKS:
-    1. Extracts all resources from the note and saves them as temporary files
-    2. Decodes base64-encoded data from the ENEX file
-    3. Creates a multi-item PDF with text + supported resources
-    4. Saves unsupported files separately
-    5. Cleans up temporary files
+    1. Decodes each resource's base64-encoded data from the ENEX file
+    2. Creates a multi-item PDF with text + supported resources
+    3. Saves unsupported files separately
 
     Args:
         note_id (str): Unique identifier like "A3B9K2"
         safe_title (str): Note title safe for filesystem
         text_content (str): Plain text content from the note (can be None)
-        resources (list): List of XML resource elements (attachments)
+        resources (list[Resource]): The note's attachments (see _parse_resources())
         note_dir (Path): Where to save the final files
         file (Path): Source ENEX file path
         notebook_name (str): Name of the notebook
@@ -379,182 +1113,133 @@ def handle_multi_item_note(
 
         Result:
         - "A3B9K2 - Meeting notes-MultiItem.pdf" (contains text + images)
-        - "A3B9K2 - Meeting notes-Video.mp4" (saved separately)
+        - "A3B9K2 - Meeting notes-resource_2.mp4" (the video, saved separately -
+          named after its position among the note's attachments)
 
     IMPORTANT:
         - Resources in ENEX files are base64-encoded (text representation of binary data)
         - We decode them to get the actual files
-        - Temporary files are cleaned up in the "finally" block (always runs)
+        - Decoded files stay in memory and are handed to create_multi_item_pdf()
+          as bytes, so no temporary files are written to disk and read back
     """
-    # List to store paths of temporary resource files we create
-    temp_resource_paths = []
+    # List of (file name, file contents) pairs for the decoded resources
+    decoded_resources = []
+
+    # Loop through each resource (attachment) in the note
+    # enumerate() gives us both the index (idx) and the resource element
+    for idx, res in enumerate(resources):
+        # Skip this resource if its data or MIME type is missing
+        if not res.data or not res.mime:
+            continue  # Go to next resource
+
+        # Create a filename for this resource
+        # Example: "resource_0.jpg", "resource_1.png"
+        # (the extension tells create_multi_item_pdf() what kind of file it is)
+        resource_name = f"resource_{idx}{res.extension}"
+
+        # Try to decode the resource
+        try:
+            # Decode base64-encoded data to get binary file data
+            # ENEX files store binary data as text using base64 encoding
+            # (_b64decode is pybase64 or binascii - see the imports)
+            decoded_resources.append((resource_name, _b64decode(res.data)))
+        except Exception as e:
+            # If decoding fails, log error with context and continue with next resource
+            logger.error(
+                f"Failed to decode resource in note '{safe_title}' "
+                f"(notebook: {notebook_name}, file: {file.name}): {e}"
+            )
+            continue  # Skip this resource, try next one
+
+    # Create the final PDF filename
+    # With serial: "A3B9K2 - Meeting Notes-MultiItem.pdf"
+    # Without serial: "Meeting Notes-MultiItem.pdf"
+    output_pdf_path = _out_path(note_dir, note_id, safe_title, "-MultiItem.pdf")
 
-    # Create a temporary directory to store extracted resources
-    # The ".temp_resources" prefix with dot makes it a hidden folder (optional)
-    temp_dir = note_dir / ".temp_resources"
-    temp_dir.mkdir(exist_ok=True)  # Create directory, don't error if exists
+    # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
+    output_pdf_path = get_unique_filepath(output_pdf_path, logs)
 
-    # Use try/finally to ensure cleanup happens even if errors occur
+    # Try to create the multi-item PDF
+    success = False
     try:
-        # Loop through each resource (attachment) in the note
-        # enumerate() gives us both the index (idx) and the resource element
-        for idx, res in enumerate(resources):
-            # Find the "data" element - contains the actual file data (base64-encoded)
-            data_element = res.find("data")
-
-            # Find the "mime" element - tells us the file type (e.g., "image/jpeg")
-            mime_element = res.find("mime")
-
-            # Skip this resource if it's missing required data
-            if data_element is None or mime_element is None:
-                continue  # Go to next resource
-
-            # Get the MIME type (e.g., "image/jpeg", "application/pdf")
-            mime_type = mime_element.text
-
-            # Skip if MIME type or data is missing
-            if not mime_type or not data_element.text:
-                continue
-
-            # Convert MIME type to file extension
-            # Example: "image/jpeg" → ".jpg"
-            # strict=True means only return extensions if we're confident
-            # or "" means return empty string if we can't guess
-            extension = mimetypes.guess_extension(mime_type, strict=True) or ""
-
-            # Create a temporary filename for this resource
-            # Example: "resource_0.jpg", "resource_1.png"
-            temp_file_name = f"resource_{idx}{extension}"
-            temp_file_path = temp_dir / temp_file_name
-
-            # Try to decode and save the resource
-            try:
-                # Decode base64-encoded data to get binary file data
-                # ENEX files store binary data as text using base64 encoding
-                binary_data = base64.b64decode(data_element.text)
+        # This function combines text + supported resources into one PDF
+        # Returns: (success_boolean, list_of_unsupported_files)
+        success, unsupported_files = create_multi_item_pdf(
+            text_content,           # Text to include (can be None)
+            decoded_resources,      # List of (name, file contents) pairs
+            output_pdf_path         # Where to save the final PDF
+        )
 
-                # Write the binary data to a temporary file
-                temp_file_path.write_bytes(binary_data)
+        # If PDF was created successfully, log it
+        if success:
+            logs[notebook_name].append({
+                "file": file.name,           # Source ENEX filename
+                "note": safe_title,          # Note title
+                "note_id": note_id,          # Unique ID
+                "success": True,             # Processing succeeded
+                "file_path": str(output_pdf_path),  # Full path to created PDF
+                "notebook": notebook_name,   # Which notebook
+                "type": "multi-item-pdf",    # Type of output
+            })
+            logger.info(f"✓ Created multi-item PDF: {output_pdf_path.name}")
+        else:
+            # Nothing could be merged - remove the empty file reserving the name
+            output_pdf_path.unlink(missing_ok=True)
+
+        # Handle unsupported files (videos, ZIP files, etc.)
+        # These can't be merged into PDF, so save them separately
+        if unsupported_files:
+            logger.warning(
+                f"⚠️  Note '{safe_title}' has {len(unsupported_files)} unsupported file(s) - saving separately "
+                f"(notebook: {notebook_name}, file: {file.name})"
+            )
 
-                # Remember this file path for later processing
-                temp_resource_paths.append(temp_file_path)
-            except Exception as e:
-                # If decoding fails, log error with context and continue with next resource
-                logger.error(
-                    f"Failed to decode resource in note '{safe_title}' "
-                    f"(notebook: {notebook_name}, file: {file.name}): {e}"
+            # Save each unsupported file to its final location
+            for unsupported_name, unsupported_data in unsupported_files:
+                # Create new filename with note ID prefix (if enabled)
+                # With serial: "A3B9K2 - Meeting Notes-resource_2.mp4"
+                # Without serial: "Meeting Notes-resource_2.mp4"
+                separate_file_path = _out_path(
+                    note_dir, note_id, safe_title, f"-{unsupported_name}"
                 )
-                continue  # Skip this resource, try next one
-
-        # Create the final PDF filename
-        # With serial: "A3B9K2 - Meeting Notes-MultiItem.pdf"
-        # Without serial: "Meeting Notes-MultiItem.pdf"
-        if note_id:
-            output_pdf_path = note_dir / f"{note_id} - {safe_title}-MultiItem.pdf"
-        else:
-            output_pdf_path = note_dir / f"{safe_title}-MultiItem.pdf"
 
-        # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
-        output_pdf_path = get_unique_filepath(output_pdf_path, logs)
+                # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
+                separate_file_path = get_unique_filepath(separate_file_path, logs)
 
-        # Try to create the multi-item PDF
-        try:
-            # This function combines text + supported resources into one PDF
-            # Returns: (success_boolean, list_of_unsupported_files)
-            success, unsupported_files = create_multi_item_pdf(
-                text_content,           # Text to include (can be None)
-                temp_resource_paths,    # List of temporary resource files
-                output_pdf_path         # Where to save the final PDF
-            )
+                # Write the decoded contents straight to the final file
+                _write_reserved(separate_file_path, [unsupported_data])
 
-            # If PDF was created successfully, log it
-            if success:
+                # Log this separately saved file
                 logs[notebook_name].append({
-                    "file": file.name,           # Source ENEX filename
-                    "note": safe_title,          # Note title
-                    "note_id": note_id,          # Unique ID
-                    "success": True,             # Processing succeeded
-                    "file_path": str(output_pdf_path),  # Full path to created PDF
-                    "notebook": notebook_name,   # Which notebook
-                    "type": "multi-item-pdf",    # Type of output
+                    "file": file.name,
+                    "note": safe_title,
+                    "note_id": note_id,
+                    "success": True,
+                    "file_path": str(separate_file_path),
+                    "notebook": notebook_name,
+                    "type": "unsupported-separate-file",
+                    "warning": "File type not supported in PDF merge - saved separately"
                 })
-                logger.info(f"✓ Created multi-item PDF: {output_pdf_path.name}")
-
-            # Handle unsupported files (videos, ZIP files, etc.)
-            # These can't be merged into PDF, so save them separately
-            if unsupported_files:
-                logger.warning(
-                    f"⚠️  Note '{safe_title}' has {len(unsupported_files)} unsupported file(s) - saving separately "
-                    f"(notebook: {notebook_name}, file: {file.name})"
-                )
+                logger.debug(f"  → Saved separately: {separate_file_path.name}")
 
-                # Move each unsupported file from temp directory to final location
-                for unsupported_file in unsupported_files:
-                    # Create new filename with note ID prefix (if enabled)
-                    # With serial: "A3B9K2 - Meeting Notes-Video.mp4"
-                    # Without serial: "Meeting Notes-Video.mp4"
-                    if note_id:
-                        separate_file_path = note_dir / f"{note_id} - {safe_title}-{unsupported_file.name}"
-                    else:
-                        separate_file_path = note_dir / f"{safe_title}-{unsupported_file.name}"
-
-                    # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
-                    separate_file_path = get_unique_filepath(separate_file_path, logs)
-
-                    # rename() moves the file to new location
-                    unsupported_file.rename(separate_file_path)
-
-                    # Log this separately saved file
-                    logs[notebook_name].append({
-                        "file": file.name,
-                        "note": safe_title,
-                        "note_id": note_id,
-                        "success": True,
-                        "file_path": str(separate_file_path),
-                        "notebook": notebook_name,
-                        "type": "unsupported-separate-file",
-                        "warning": "File type not supported in PDF merge - saved separately"
-                    })
-                    logger.debug(f"  → Saved separately: {separate_file_path.name}")
-
-        except Exception as e:
-            # If PDF creation fails, log the error with full context
-            logger.error(
-                f"✗ Error creating multi-item PDF for '{safe_title}': {e} "
-                f"(notebook: {notebook_name}, file: {file.name})"
-            )
-            logs[notebook_name].append({
-                "file": file.name,
-                "note": safe_title,
-                "note_id": note_id,
-                "success": False,  # Mark as failed
-                "notebook": notebook_name,
-                "error": f"PDF creation failed: {str(e)}"  # Save error message
-            })
-
-    finally:
-        # CLEANUP: This block always runs, even if errors occurred above
-        # This ensures we don't leave temporary files lying around
+    except Exception as e:
+        # Don't leave an empty or half-written PDF behind
+        if not success:
+            output_pdf_path.unlink(missing_ok=True)
 
-        # Delete temporary resource files
-        for temp_file in temp_resource_paths:
-            try:
-                # Only delete if file exists and is still in temp directory
-                # (it might have been moved if it was unsupported)
-                if temp_file.exists() and temp_file.parent == temp_dir:
-                    temp_file.unlink()  # Delete the file
-            except Exception:
-                # If deletion fails (permissions, etc.), just continue
-                pass
-
-        # Remove the temporary directory if it's empty
-        try:
-            # Check if directory exists and has no files
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()  # Remove empty directory
-        except Exception:
-            # If removal fails, continue anyway
-            pass
+        # If PDF creation fails, log the error with full context
+        logger.error(
+            f"✗ Error creating multi-item PDF for '{safe_title}': {e} "
+            f"(notebook: {notebook_name}, file: {file.name})"
+        )
+        logs[notebook_name].append({
+            "file": file.name,
+            "note": safe_title,
+            "note_id": note_id,
+            "success": False,  # Mark as failed
+            "notebook": notebook_name,
+            "error": f"PDF creation failed: {str(e)}"  # Save error message
+        })
 
 
 def handle_single_resource(
@@ -569,15 +1254,15 @@ def handle_single_resource(
     and no text content. Saves the file as-is with the note's ID and title.
 
     HOW IT WORKS:
-    1. Extracts the resource data and MIME type from XML
-    2. Determines the file extension from MIME type
+    1. Checks that the resource has data and a MIME type
+    2. Builds the file name from the title and the resource's extension
     3. Decodes base64 data to binary
     4. Saves the file with ID prefix
 
     Args:
         note_id (str): Unique identifier for the note
         safe_title (str): Note title safe for filesystem
-        resource (Element): XML element containing one resource/attachment
+        resource (Resource): The note's attachment (see _parse_resources())
         note_dir (Path): Directory where the file should be saved
         file (Path): Source ENEX file path
         notebook_name (str): Name of the notebook
@@ -591,12 +1276,8 @@ def handle_single_resource(
         This function doesn't convert to PDF - it saves the original file format.
         The file is saved as-is (image stays as image, PDF stays as PDF, etc.)
     """
-    # Extract data and MIME type from the resource XML element
-    data_element = resource.find("data")  # Contains base64-encoded file data
-    mime_element = resource.find("mime")  # Contains MIME type like "image/jpeg"
-
-    # Validate that we have both required elements
-    if data_element is None or mime_element is None:
+    # Validate that we have both the data and the MIME type
+    if not resource.data or not resource.mime:
         # Log error and exit - can't process without data and type info
         logs[notebook_name].append({
             "file": file.name,
@@ -608,41 +1289,21 @@ def handle_single_resource(
         })
         return  # Can't continue without this information
 
-    # Get the actual MIME type string and check it's not empty
-    mime_type = mime_element.text
-    if not mime_type or not data_element.text:
-        # MIME type or data is missing - log error and exit
-        logs[notebook_name].append({
-            "file": file.name,
-            "note": safe_title,
-            "note_id": note_id,
-            "success": False,
-            "notebook": notebook_name,
-            "error": "Missing mime type or resource data"
-        })
-        return
-
-    # Convert MIME type to file extension
-    # Example: "image/jpeg" → ".jpg", "application/pdf" → ".pdf"
-    extension = mimetypes.guess_extension(mime_type, strict=True) or ""
-
     # Create filename: "ID - Title.extension" or just "Title.extension" if preserving
     # With serial: "A3B9K2 - Vacation Photo.jpg"
     # Without serial: "Vacation Photo.jpg"
-    if note_id:
-        file_name = f"{note_id} - {safe_title}{extension}"
-    else:
-        file_name = f"{safe_title}{extension}"
-    file_path = note_dir / file_name
+    # (resource.extension comes from the MIME type, e.g. "image/jpeg" → ".jpg")
+    file_path = _out_path(note_dir, note_id, safe_title, resource.extension)
 
     # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
     file_path = get_unique_filepath(file_path, logs)
 
     # Try to decode and save the file
     try:
-        # Decode base64-encoded data to get binary file content
-        binary_data = base64.b64decode(data_element.text)
-        file_path.write_bytes(binary_data)
+        # Decode base64-encoded data to get binary file content, writing it
+        # to the file piece by piece (big attachments never need a full
+        # decoded copy in memory)
+        _write_reserved(file_path, _decode_base64_chunks(resource.data))
 
         # Log successful save
         logs[notebook_name].append({
@@ -658,6 +1319,8 @@ def handle_single_resource(
 
     except Exception as e:
         # If anything goes wrong (decoding error, write permission, etc.)
+        # Don't leave an empty or half-written file behind
+        file_path.unlink(missing_ok=True)
         logs[notebook_name].append({
             "file": file.name,
             "note": safe_title,
@@ -681,7 +1344,7 @@ def handle_text_only_note(
 
     HOW IT WORKS:
     1. Creates a PDF filename with the note ID and title
-    2. Calls create_text_pdf() to convert text to PDF format
+    2. Calls create_text_pdf_fast() to convert text to PDF format
     3. Logs the result (success or failure)
 
     Args:
@@ -695,21 +1358,18 @@ def handle_text_only_note(
 
     EXAMPLE:
         Note: "Shopping List" with text "Milk, Eggs, Bread..."
-        Result: "A3B9K2-Shopping List.pdf" created in notebook directory
+        Result: "A3B9K2 - Shopping List.pdf" created in notebook directory
 
     NOTE:
         All text-only notes are converted to PDF format for consistency.
         The PDF uses standard formatting (11pt font, letter-sized pages).
     """
     # Create the PDF filename
-    # With serial: "ID-Title.pdf" (note: no space after ID, different from other handlers)
-    # Example: "A3B9K2-Shopping List.pdf"
+    # With serial: "ID - Title.pdf" (same format as the other handlers)
+    # Example: "A3B9K2 - Shopping List.pdf"
     # Without serial: "Title.pdf"
     # Example: "Shopping List.pdf"
-    if note_id:
-        file_path = note_dir / f"{note_id}-{safe_title}.pdf"
-    else:
-        file_path = note_dir / f"{safe_title}.pdf"
+    file_path = _out_path(note_dir, note_id, safe_title, ".pdf")
 
     # Ensure unique filepath (adds _1, _2 suffix if collision occurs)
     file_path = get_unique_filepath(file_path, logs)
@@ -718,7 +1378,8 @@ def handle_text_only_note(
     try:
         # Convert the text content to a PDF file
         # This function handles all the PDF formatting (fonts, margins, pages, etc.)
-        create_text_pdf(text_content, file_path)
+        # It draws lines straight onto the page - plain text needs no layout engine
+        create_text_pdf_fast(text_content, file_path)
 
         # Log successful PDF creation
         logs[notebook_name].append({
@@ -733,6 +1394,9 @@ def handle_text_only_note(
         logger.info(f"✓ Created text-only PDF: {file_path.name}")
 
     except Exception as e:
+        # Don't leave an empty or half-written PDF behind
+        file_path.unlink(missing_ok=True)
+
         # If PDF creation fails, log the error with full context
         logger.error(
             f"✗ Error creating text-only PDF for '{safe_title}': {e} "
@@ -761,10 +1425,12 @@ def process_files(output_directory: Path, dry_run: bool, preserve_filenames: boo
 
     HOW IT WORKS:
     - Sets up input/output directories
-    - Loads or creates extraction log
-    - Processes all ENEX files sequentially
+    - Loads or creates extraction log (plus anything an interrupted run left behind)
+    - Reads the ENEX files and converts their notes in parallel, one worker
+      process per CPU core
+    - Uploads each finished notebook to Google Drive in the background while
+      the others are still processed (unless dry_run is True)
     - Saves logs to JSON file
-    - Uploads to Google Drive (unless dry_run is True)
 
     Args:
         output_directory (Path): Where to save extracted notes (e.g., Path("./EverNote Notes"))
@@ -779,9 +1445,11 @@ def process_files(output_directory: Path, dry_run: bool, preserve_filenames: boo
         1. Check input directory exists
         2. Create output directory
         3. Find all .enex files
-        4. Process each file → extracts notes → creates PDFs/files
-        5. Save logs
-        6. Upload to Google Drive (if not dry run)
+        4. Log in to Google Drive (if not dry run)
+        5. Process each file → extracts notes → creates PDFs/files
+           → upload the notebook's folder in the background (if not dry run)
+        6. Save logs
+        7. Finish uploading to Google Drive (if not dry run)
     """
     # Inform user where files will be saved
     logger.info(f"Processing notes into: {output_directory}")
@@ -793,10 +1461,19 @@ def process_files(output_directory: Path, dry_run: bool, preserve_filenames: boo
     # Define paths - these are relative to where you run the script from
     input_directory = Path("./input_data")  # Where ENEX files are stored
     extraction_log_file = Path("./extraction_log.json")  # Log file for tracking progress
+    journal_file = Path("./extraction_log.jsonl")  # Entries written while processing
 
     # Load existing log file (or create empty one if it doesn't exist)
     logs_json = load_extraction_log(extraction_log_file)
 
+    # If the previous run was interrupted, keep what it logged
+    # The merged log is saved right away, so the journal can start over empty
+    recovered = recover_log_journal(logs_json, journal_file)
+    if recovered:
+        logger.info(f"Recovered {recovered} log entries from an interrupted run")
+        finalize_logs(logs_json, extraction_log_file)
+        journal_file.unlink()
+
     # Validate that input directory exists
     if not input_directory.exists():
         # Raise an exception (crash) with helpful error message
@@ -817,15 +1494,165 @@ def process_files(output_directory: Path, dry_run: bool, preserve_filenames: boo
 
     logger.info(f"Found {len(files)} ENEX file(s) to process")
 
-    # Process each ENEX file
-    # Each file represents one notebook from Evernote
-    for file in files:
-        logger.info(f"Processing: {file.name}")
-        # This processes the entire ENEX file and all notes within it
-        process_enex_file(file, output_directory, logs_json, preserve_filenames)
+    # Log in to Google Drive before processing starts, so each notebook can be
+    # uploaded as soon as it's finished (and a login problem shows up right away)
+    # Without credentials.json, processing still runs and the error comes at the end
+    if not dry_run and os.path.exists("credentials.json"):
+        uploader = BackgroundUploader(authenticate_drive(), output_directory)
+    else:
+        uploader = None
+
+    # Convert the notes in parallel
+    # Every note is independent of the others, so the notes are handed to a pool
+    # of worker processes (one per CPU core) - this keeps all cores busy even
+    # when there's only one big notebook. Separate processes (not threads) are
+    # used because decoding attachments and building PDFs keep the CPU busy.
+    # The main process reads the ENEX files and collects the results in order.
+    workers = os.cpu_count() or 1
+    max_pending = workers * PENDING_NOTES_PER_WORKER
+
+    # Notes handed out whose results haven't been collected yet, oldest first:
+    # (notebook name, Future or logs) - None instead marks the end of a notebook
+    pending = deque()
+
+    # Logs of the notebooks that are still being processed
+    notebook_logs = {}
+
+    # Every collected log entry is also appended to the journal right away
+    journal = LogWriter(journal_file)
+
+    # The note each Future is converting: Future → (ENEX file, note ID, title)
+    # (used to log a failure if its worker crashes)
+    submitted = {}
+
+    def submit(convert, note_xml, notebook_name, file, note_dir, note_id, safe_title):
+        """Hand a note to the worker processes (see process_enex_file())."""
+        try:
+            future = executor.submit(
+                convert, note_xml, notebook_name, file, note_dir, note_id, safe_title
+            )
+        except BrokenProcessPool as e:
+            # A worker process died and the pool can't take more notes - the
+            # note is logged as failed (below) instead of stopping the run
+            future = Future()
+            future.set_exception(e)
+        submitted[future] = (file, note_id, safe_title)
+        return future
+
+    def collect_oldest():
+        """Collect the result of the oldest pending note (waiting for it if needed)."""
+        # The note stays in "pending" until its result is in, so an interruption
+        # while waiting for it still finds it there (see journal_finished())
+        notebook_name, item = pending[0]
+        logs = notebook_logs[notebook_name]
+
+        if item is None:
+            pending.popleft()
+            # All of this notebook's notes are done - merge its logs into the overall log
+            _merge_logs(logs_json, notebook_logs.pop(notebook_name))
+
+            # Start uploading this notebook's folder while the others are processed
+            if uploader is not None:
+                uploader.submit(output_directory / notebook_name)
+            return
+
+        if isinstance(item, dict):
+            note_logs = item
+        else:
+            file, note_id, safe_title = submitted[item]
+            try:
+                # result() waits for the worker and returns the note's logs
+                # (or re-raises its error)
+                note_logs = item.result()
+            except Exception as e:
+                # One failed note (or a crashed worker) shouldn't end the whole
+                # run - log it like any other failed note
+                logger.error(
+                    f"✗ Failed to convert note '{safe_title}' "
+                    f"(notebook: {notebook_name}, file: {file.name}): {e}"
+                )
+                note_logs = {notebook_name: [{
+                    "file": file.name,
+                    "note": safe_title,
+                    "note_id": note_id,
+                    "success": False,
+                    "notebook": notebook_name,
+                    "error": f"Note conversion failed: {e}",
+                }]}
+            del submitted[item]
+        pending.popleft()
+
+        for key, entries in note_logs.items():
+            logs.setdefault(key, []).extend(entries)
+            journal.extend(entries)
+
+    def journal_finished():
+        """
+        After an interruption: journal the notes that were converted but not collected.
+
+        Their files are already in the output folder, so the next run must
+        know about them - otherwise it would convert them again (with new IDs)
+        and leave the first files behind as duplicates.
+        """
+        for _, item in pending:
+            if isinstance(item, dict):
+                note_logs = item
+            elif item is not None and item.done() and not item.cancelled():
+                if item.exception() is not None:
+                    continue  # Nothing was saved for this note
+                note_logs = item.result()
+            else:
+                continue  # End-of-notebook marker
+            for entries in note_logs.values():
+                journal.extend(entries)
+
+    try:
+        with uploader or nullcontext(), ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_worker_context(),
+            initializer=_init_worker,
+            initargs=(logging.getLogger().level,),
+        ) as executor:
+            try:
+                for file in files:
+                    notebook_name = file.stem
+                    notebook_logs[notebook_name] = {notebook_name: []}
+
+                    # The notebook's entries from the previous run are passed along,
+                    # so notes that were already saved are skipped
+                    for item in process_enex_file(
+                        file,
+                        output_directory,
+                        submit,
+                        preserve_filenames,
+                        logs_json.get(notebook_name),
+                    ):
+                        pending.append((notebook_name, item))
+
+                        # Don't read further ahead than the workers can keep up with
+                        # (every pending note is held in memory)
+                        if len(pending) > max_pending:
+                            collect_oldest()
+
+                    pending.append((notebook_name, None))
+
+                # Collect the remaining results
+                while pending:
+                    collect_oldest()
+            except BaseException:
+                # Interrupted (Ctrl+C) or failed: don't start the notes that are
+                # still waiting, let the ones being converted finish, and journal
+                # every note that was saved before stopping
+                executor.shutdown(wait=True, cancel_futures=True)
+                journal_finished()
+                raise
+    finally:
+        journal.close()
 
     # Save all the logs we've accumulated to the JSON file
+    # Everything in the journal is now in the JSON file, so it's no longer needed
     finalize_logs(logs_json, extraction_log_file)
+    journal_file.unlink(missing_ok=True)
     logger.info(f"Saved extraction log to: {extraction_log_file}")
 
     # Compute and print summary statistics
@@ -836,15 +1663,12 @@ def process_files(output_directory: Path, dry_run: bool, preserve_filenames: boo
     if dry_run:
         # Dry run - just tell user we're done, no upload
         logger.info("✓ Dry run complete. No files were uploaded.")
-    elif os.path.exists("credentials.json"):
-        # Credentials file exists - proceed with upload
-        # First, authenticate with Google Drive
-        service_account = authenticate_drive()
-
-        # Upload the entire output directory to Google Drive
+    elif uploader is not None:
+        # Wait for the background uploads, then upload anything they missed
+        # (e.g. files left in the output folder by an earlier run)
         # This recreates the folder structure in Drive
-        upload_directory(service_account, output_directory)
-    elif not os.path.exists("credentials.json"):
+        uploader.finish()
+    else:
         # Credentials file missing - raise helpful error
         raise FileNotFoundError("""credentials.json not found!.
 Please create a credentials.json file in the root directory of the project.
@@ -941,8 +1765,8 @@ def finalize_logs(logs_json: dict, log_file: Path):
     This creates a permanent record of what was processed.
 
     HOW IT WORKS:
-    - Converts the Python dictionary to JSON string
-    - Formats it nicely with indentation (indent=4)
+    - Converts the Python dictionary to JSON
+    - Formats it nicely with indentation (2 spaces)
     - Writes it to the log file
 
     Args:
@@ -954,10 +1778,10 @@ def finalize_logs(logs_json: dict, log_file: Path):
         finalize_logs(logs, Path("./extraction_log.json"))
         # Creates extraction_log.json with formatted JSON
     """
-    # json.dumps() converts Python dict to JSON string
-    # indent=4 makes it readable (4 spaces per indentation level)
-    # write_text() overwrites the file with new content
-    log_file.write_text(json.dumps(logs_json, indent=4))
+    # _json_dumps() converts Python dict to JSON (as bytes)
+    # pretty=True makes it readable (2 spaces per indentation level)
+    # write_bytes() overwrites the file with new content
+    log_file.write_bytes(_json_dumps(logs_json, pretty=True))
 
 
 # This block only runs when the script is executed directly (not when imported)
@@ -1037,8 +1861,8 @@ if __name__ == "__main__":
     # Setup logging format with timestamp, level, and message
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        format=LOG_FORMAT,
+        datefmt=LOG_DATE_FORMAT
     )
 
     logger.info("Starting Evernote to Google Drive migration")
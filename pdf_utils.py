@@ -31,26 +31,27 @@ These files are saved separately with ID prefix. Future handling requires discus
 """
 
 # Standard library imports
+import hashlib  # For fingerprinting image contents (to reuse their converted PDF)
+import io  # For handing in-memory file data to the PDF and image libraries
+import logging  # For error and progress messages that respect --verbose / --quiet
+import os  # For splitting the extension off a file name
 import random  # For generating random IDs
 import string  # For character sets used in ID generation
+from functools import cache  # For building the text styles only once
 from pathlib import Path  # For handling file paths
-from typing import Optional  # Type hints for better code documentation
+from typing import BinaryIO, Optional, Union  # Type hints for better code documentation
 
 # Third-party library imports for PDF and image processing
-from PIL import Image  # Python Imaging Library - for opening and processing images
-from pypdf import PdfReader, PdfWriter  # For reading and merging existing PDF files
+# Only small constants are imported here. The heavy libraries (Pillow, pypdf and
+# ReportLab's layout and drawing modules) are imported inside the functions that
+# use them, so starting the program (or --help) doesn't wait for them to load.
+# Python keeps imported modules in memory, so this only costs time on first use.
 from reportlab.lib.enums import TA_LEFT  # Text alignment constant (left align)
 from reportlab.lib.pagesizes import letter  # Standard page sizes (letter = 8.5x11 inches)
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet  # For text styling in PDFs
 from reportlab.lib.units import inch  # Unit conversion (1 inch = 72 points)
-from reportlab.platypus import (
-    Image as RLImage,  # ReportLab's Image class (renamed to avoid conflict with PIL.Image)
-)
-from reportlab.platypus import (  # ReportLab's document layout system
-    Paragraph,  # Formats text as paragraphs
-    SimpleDocTemplate,  # Creates PDF documents
-    Spacer,  # Adds vertical spacing
-)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # FILE TYPE CONSTANTS
@@ -81,6 +82,50 @@ UNSUPPORTED_FORMATS = (
     UNSUPPORTED_OFFICE_FORMATS
 )
 
+# Category of every known extension, built once from the sets above
+# Example: EXT_CATEGORY[".jpg"] == 'image', EXT_CATEGORY[".mp4"] == 'unsupported'
+# Extensions that aren't in here are 'unknown'
+EXT_CATEGORY = {
+    **dict.fromkeys(UNSUPPORTED_FORMATS, 'unsupported'),
+    **dict.fromkeys(SUPPORTED_IMAGE_FORMATS, 'image'),
+    **dict.fromkeys(SUPPORTED_PDF_FORMAT, 'pdf'),
+}
+
+# Categories that can be merged into a PDF (everything else is saved separately)
+MERGEABLE_CATEGORIES = frozenset({'image', 'pdf'})
+
+# Characters used in note IDs: uppercase letters A-Z and digits 0-9
+# string.ascii_uppercase = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# string.digits = "0123456789"
+ID_CHARACTERS = string.ascii_uppercase + string.digits
+
+# ============================================================================
+# IMAGE PAGE LAYOUT CONSTANTS
+# ============================================================================
+# Image pages are letter-sized with a 0.5 inch margin on every side. These
+# never change, so they are worked out once here instead of on every call.
+PAGE_WIDTH, PAGE_HEIGHT = letter  # 612 x 792 points
+IMAGE_PAGE_MARGIN = 0.5 * inch
+
+# Largest size an image can be drawn at: the space inside the margins, less
+# the 6-point padding ReportLab keeps on each side of that space - an image
+# even slightly bigger than what's left can't be placed at all
+FRAME_PADDING = 6
+IMAGE_MAX_WIDTH = PAGE_WIDTH - 2 * IMAGE_PAGE_MARGIN - 2 * FRAME_PADDING
+IMAGE_MAX_HEIGHT = PAGE_HEIGHT - 2 * IMAGE_PAGE_MARGIN - 2 * FRAME_PADDING
+
+# ============================================================================
+# CONVERTED IMAGE CACHE
+# ============================================================================
+# The same image (a logo, a letterhead scan) is often attached to many notes.
+# The PDFs made from images are remembered here, keyed by a fingerprint of the
+# image contents, so identical images are only converted once.
+# Each worker process has its own cache. Only small PDFs are kept, and only a
+# limited number of them, so the cache never uses more than about 16 MB.
+IMAGE_PDF_CACHE_MAX_ENTRIES = 16
+IMAGE_PDF_CACHE_MAX_PDF_SIZE = 1024 * 1024  # 1 MB
+_image_pdf_cache: dict[bytes, bytes] = {}  # fingerprint -> PDF bytes (oldest first)
+
 
 def generate_unique_id(length: int = 6) -> str:
     """
@@ -92,7 +137,7 @@ def generate_unique_id(length: int = 6) -> str:
 
     HOW IT WORKS:
     1. Combines uppercase letters (A-Z) and digits (0-9)
-    2. Randomly selects 'length' characters from this set
+    2. Randomly selects 'length' characters from this set (in one call)
     3. Joins them into a string
 
     Args:
@@ -107,18 +152,14 @@ def generate_unique_id(length: int = 6) -> str:
 
     IMPORTANT:
         - IDs are random, not sequential
+        - IDs are only generated in the main process (process_enex_file()), so
+          there is one random sequence for the whole run
         - Very small chance of duplicates (with 6 chars = 36^6 combinations)
         - Uses uppercase only for readability (no confusing 0/O, 1/l)
     """
-    # Create character set: uppercase letters A-Z and digits 0-9
-    # string.ascii_uppercase = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    # string.digits = "0123456789"
-    characters = string.ascii_uppercase + string.digits
-
-    # random.choices() randomly selects 'length' characters (with replacement)
+    # random.choices() picks 'length' characters from ID_CHARACTERS at once
     # ''.join() combines them into a single string
-    # k=length means select this many characters
-    return ''.join(random.choices(characters, k=length))
+    return ''.join(random.choices(ID_CHARACTERS, k=length))
 
 
 def categorize_file_type(file_path: Path) -> str:
@@ -132,7 +173,7 @@ def categorize_file_type(file_path: Path) -> str:
     HOW IT WORKS:
     1. Gets the file extension (the part after the dot)
     2. Converts to lowercase for case-insensitive matching
-    3. Checks against known format lists
+    3. Looks it up in EXT_CATEGORY (built from the format lists)
     4. Returns category string
 
     Args:
@@ -159,21 +200,8 @@ def categorize_file_type(file_path: Path) -> str:
     # Get the file extension (everything after the last dot)
     # .lower() makes it case-insensitive (.JPG = .jpg)
     # Example: Path("photo.JPG") → suffix = ".jpg"
-    suffix = file_path.suffix.lower()
-
-    # Check which category this file belongs to
-    if suffix in SUPPORTED_IMAGE_FORMATS:
-        # It's a supported image format
-        return 'image'
-    elif suffix in SUPPORTED_PDF_FORMAT:
-        # It's a PDF file
-        return 'pdf'
-    elif suffix in UNSUPPORTED_FORMATS:
-        # It's a known unsupported format (video, audio, archive, etc.)
-        return 'unsupported'
-    else:
-        # Extension not recognized - treat as unknown
-        return 'unknown'
+    # Then look up its category in one step ('unknown' if it isn't listed)
+    return EXT_CATEGORY.get(file_path.suffix.lower(), 'unknown')
 
 
 def separate_supported_unsupported_resources(
@@ -188,9 +216,9 @@ def separate_supported_unsupported_resources(
     - Files that must be saved separately (videos, archives, etc.)
 
     HOW IT WORKS:
-    1. Loops through each file path
-    2. Categorizes each file (image, pdf, unsupported, unknown)
-    3. Adds to appropriate list based on category
+    1. Categorizes each file once (image, pdf, unsupported, unknown)
+    2. Collects the mergeable ones (MERGEABLE_CATEGORIES) and the rest into
+       two lists, keeping the original order
 
     Args:
         resource_paths (List[Path]): List of file paths to categorize
@@ -210,28 +238,84 @@ def separate_supported_unsupported_resources(
     NOTE:
         Unknown file types go into unsupported list (better safe than sorry)
     """
-    # Initialize empty lists to store categorized files
-    supported = []      # Files we can merge into PDF
-    unsupported = []    # Files we must save separately
-
-    # Loop through each file path
-    for path in resource_paths:
-        # Determine what type of file this is
-        file_type = categorize_file_type(path)
-
-        # If it's an image or PDF, we can include it in the merged PDF
-        if file_type in ['image', 'pdf']:
-            supported.append(path)
-        else:
-            # Everything else (unsupported, unknown) goes to separate list
-            unsupported.append(path)
+    # Determine what type of file each one is (same order as resource_paths)
+    file_types = [EXT_CATEGORY.get(path.suffix.lower(), 'unknown') for path in resource_paths]
+
+    # Images and PDFs can be included in the merged PDF
+    supported = [
+        path for path, file_type in zip(resource_paths, file_types)
+        if file_type in MERGEABLE_CATEGORIES
+    ]
+    # Everything else (unsupported, unknown) goes to separate list
+    unsupported = [
+        path for path, file_type in zip(resource_paths, file_types)
+        if file_type not in MERGEABLE_CATEGORIES
+    ]
 
     # Return both lists as a tuple
     # Tuple = immutable ordered pair, like (list1, list2)
     return supported, unsupported
 
 
-def create_text_pdf(text_content: str, output_path: Path) -> None:
+def _pdf_destination(output_path: Union[Path, BinaryIO]):
+    """
+    Turn an output Path into what ReportLab expects: a file name as a string.
+
+    Open files (like io.BytesIO, for PDFs that are only needed in memory)
+    are passed through unchanged - ReportLab writes into them directly.
+    """
+    return output_path if hasattr(output_path, "write") else str(output_path)
+
+
+@cache
+def _configure_reportlab() -> None:
+    """
+    Adjust ReportLab's global settings before it creates a PDF (done once).
+
+    Image data and page content are stored in the PDF as plain binary instead
+    of ASCII85 text. ReportLab ASCII85-encodes them by default, which makes
+    them 25% bigger and - without its optional C extension - is very slow pure
+    Python. With it switched off, JPEG photos are copied into the PDF byte for
+    byte. Every function that creates a PDF calls this first, so all of them
+    produce the same (smaller) output.
+    """
+    from reportlab import rl_config  # ReportLab's global settings
+
+    rl_config.useA85 = 0
+
+
+@cache
+def _text_pdf_styles():
+    """
+    Build the paragraph style used by create_text_pdf().
+
+    It never changes, so it's built on the first call and reused after that
+    (building ReportLab's sample style sheet every time is surprisingly slow).
+
+    Returns:
+        ParagraphStyle: The style for the note text
+    """
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet  # Text styling
+
+    # Get default text styles from ReportLab
+    # These provide basic formatting options
+    styles = getSampleStyleSheet()
+
+    # Create a custom style for our text content
+    # This gives us control over how text looks
+    content_style = ParagraphStyle(
+        'CustomContent',          # Style name (can be anything)
+        parent=styles['Normal'],  # Start with normal style, then customize
+        fontSize=11,              # Font size in points (11pt is readable)
+        leading=14,               # Line spacing (space between lines)
+        alignment=TA_LEFT,        # Left-align text (TA_LEFT = text align left)
+        spaceAfter=12,            # Space after each paragraph (in points)
+    )
+
+    return content_style
+
+
+def create_text_pdf(text_content: str, output_path: Union[Path, BinaryIO]) -> None:
     """
     Create a PDF from text content.
 
@@ -249,7 +333,8 @@ def create_text_pdf(text_content: str, output_path: Path) -> None:
     Args:
         text_content (str): The plain text to convert to PDF
                            Example: "First paragraph\n\nSecond paragraph"
-        output_path (Path): Where to save the PDF file
+        output_path (Path | BinaryIO): Where to save the PDF file, or an open
+                                       binary file (e.g. io.BytesIO) to write it into
                            Example: Path("./output.pdf")
 
     EXAMPLE:
@@ -263,46 +348,48 @@ def create_text_pdf(text_content: str, output_path: Path) -> None:
         - Paragraph: Formatted text block with styling
         - Spacer: Empty vertical space between elements
     """
+    from reportlab.platypus import (  # ReportLab's document layout system
+        Paragraph,  # Formats text as paragraphs
+        SimpleDocTemplate,  # Creates PDF documents
+        Spacer,  # Adds vertical spacing
+    )
+
+    _configure_reportlab()
+
     # Create a PDF document template
     # SimpleDocTemplate manages pages, margins, etc.
-    # str(output_path) converts Path to string (ReportLab needs string)
+    # _pdf_destination() converts Path to string (ReportLab needs string)
     # pagesize=letter means 8.5 x 11 inch pages
-    doc = SimpleDocTemplate(str(output_path), pagesize=letter)
+    doc = SimpleDocTemplate(_pdf_destination(output_path), pagesize=letter)
 
     # "story" is ReportLab's term for the list of elements to add to the PDF
     # We'll add paragraphs, spacers, etc. to this list
     story = []
 
-    # Get default text styles from ReportLab
-    # These provide basic formatting options
-    styles = getSampleStyleSheet()
+    # Text style (11pt, left-aligned) - built once, see _text_pdf_styles()
+    content_style = _text_pdf_styles()
 
-    # Create a custom style for our text content
-    # This gives us control over how text looks
-    content_style = ParagraphStyle(
-        'CustomContent',          # Style name (can be anything)
-        parent=styles['Normal'],  # Start with normal style, then customize
-        fontSize=11,              # Font size in points (11pt is readable)
-        leading=14,               # Line spacing (space between lines)
-        alignment=TA_LEFT,        # Left-align text (TA_LEFT = text align left)
-        spaceAfter=12,            # Space after each paragraph (in points)
-    )
-
-    # Split text into paragraphs based on newline characters
+    # Split text into paragraphs based on line breaks
     # Example: "Line1\nLine2\n\nLine3" → ["Line1", "Line2", "", "Line3"]
-    paragraphs = text_content.split('\n')
+    # splitlines() also understands Windows line breaks ("\r\n")
+    paragraphs = text_content.splitlines()
 
     # Process each paragraph
     for para_text in paragraphs:
+        # .strip() removes leading/trailing whitespace (done once per line)
+        para_text = para_text.strip()
+
         # Check if paragraph has actual content (not just whitespace)
-        if para_text.strip():  # .strip() removes leading/trailing whitespace
+        if para_text:
             # Create a formatted paragraph with our custom style
-            para = Paragraph(para_text.strip(), content_style)
+            para = Paragraph(para_text, content_style)
             story.append(para)  # Add paragraph to the document
         else:
             # Empty line - add vertical spacing instead of empty paragraph
             # Spacer(width, height) - width=1 doesn't matter, height is what we want
             # 0.2 * inch = about 14 points of space
+            # (a new Spacer every time: ReportLab stores layout details on each
+            # element while building, so one can't be shared between lines)
             story.append(Spacer(1, 0.2 * inch))
 
     # Build (render) the PDF document
@@ -310,117 +397,228 @@ def create_text_pdf(text_content: str, output_path: Path) -> None:
     doc.build(story)
 
 
-def image_to_pdf(image_path: Path, output_path: Path) -> None:
+def create_text_pdf_fast(text_content: str, output_path: Union[Path, BinaryIO]) -> None:
     """
-    Convert an image file to PDF.
+    Create a PDF from plain text, drawing the lines directly onto the pages.
 
     WHAT THIS DOES:
-    Takes an image file (JPG, PNG, etc.) and creates a PDF containing that image.
-    The image is scaled to fit on a letter-sized page while maintaining its aspect ratio.
+    Produces the same kind of document as create_text_pdf() (11pt text,
+    1 inch margins, letter-sized pages), but skips ReportLab's layout engine.
+    Used for text-only notes, where there is nothing to lay out except lines.
 
     HOW IT WORKS:
-    1. Opens the image file using PIL (Pillow)
-    2. Converts color modes (RGBA → RGB) for PDF compatibility
-    3. Calculates proper size to fit on page (maintaining aspect ratio)
-    4. Creates a PDF with the image centered/fitted on the page
+    1. Wraps each line of text to fit between the margins (simpleSplit)
+    2. Draws the wrapped lines top to bottom with the low-level canvas
+    3. Starts a new page whenever the bottom margin is reached
+    4. Blank lines become a line of empty space, like the spacers
+       create_text_pdf() adds
+
+    Text is drawn as-is, so characters like "<" and "&" need no escaping
+    (create_text_pdf() treats them as markup).
+
+    Args:
+        text_content (str): The plain text to convert to PDF
+        output_path (Path | BinaryIO): Where to save the PDF file, or an open binary file
+
+    EXAMPLE:
+        create_text_pdf_fast("Milk\nEggs\nBread", Path("./list.pdf"))
+        # Creates list.pdf with one item per line
+    """
+    from reportlab.lib.utils import simpleSplit  # Wraps a line of text to a given width
+    from reportlab.pdfgen import canvas  # Low-level drawing API (no layout engine)
+
+    _configure_reportlab()
+
+    font_name, font_size = "Helvetica", 11
+    leading = 14  # Distance from one line to the next (same as create_text_pdf)
+    paragraph_gap = 12  # Extra space after each paragraph (create_text_pdf's spaceAfter)
+    page_width, page_height = letter
+    margin = inch
+    max_width = page_width - 2 * margin
+
+    pdf = canvas.Canvas(_pdf_destination(output_path), pagesize=letter)
+    pdf.setFont(font_name, font_size)
+    y = page_height - margin
+
+    def next_line():
+        # Move down one line, starting a new page when we run out of room
+        nonlocal y
+        y -= leading
+        if y < margin:
+            pdf.showPage()
+            pdf.setFont(font_name, font_size)  # Each new page starts with default settings
+            y = page_height - margin - leading
+
+    for para_text in text_content.splitlines():
+        para_text = para_text.strip()
+        if not para_text:
+            # Empty line - leave a line of vertical space
+            y -= leading
+            continue
+
+        for line in simpleSplit(para_text, font_name, font_size, max_width):
+            next_line()
+            pdf.drawString(margin, y, line)
+        y -= paragraph_gap
+
+    pdf.save()
+
+
+def image_to_pdf(image_path: Union[Path, BinaryIO], output_path: Union[Path, BinaryIO]) -> None:
+    """
+    Convert an image file to a one-page PDF (see images_to_pdf() for details).
 
     Args:
-        image_path (Path): Path to the image file to convert
+        image_path (Path | BinaryIO): Path to the image file to convert, or an
+                                      open binary file containing the image
                            Example: Path("./photo.jpg")
-        output_path (Path): Where to save the PDF
+        output_path (Path | BinaryIO): Where to save the PDF, or an open binary
+                                       file (e.g. io.BytesIO) to write it into
                             Example: Path("./photo.pdf")
 
     EXAMPLE:
         image_to_pdf(Path("photo.jpg"), Path("photo.pdf"))
         # Creates photo.pdf containing the image
+    """
+    images_to_pdf([image_path], output_path)
+
+
+def images_to_pdf(
+    image_paths: list[Union[Path, BinaryIO]], output_path: Union[Path, BinaryIO]
+) -> None:
+    """
+    Convert image files to one PDF, with each image on its own page.
+
+    WHAT THIS DOES:
+    Takes image files (JPG, PNG, etc.) and creates a PDF containing those images.
+    Each image is scaled to fit on a letter-sized page while maintaining its
+    aspect ratio. All images go into the same document, so a note full of
+    photos becomes one PDF in a single pass - no per-image PDFs to merge.
+
+    HOW IT WORKS:
+    1. Reads each image's size using PIL (Pillow) - only the file header is
+       read, the pixels are not decoded yet
+    2. Calculates proper size to fit on page (maintaining aspect ratio)
+    3. Adds the image to the document, with a page break before the next one
+    4. Builds (renders) the PDF once all images are added - ReportLab decodes
+       each image once here (JPEG photos are copied in without decoding at all)
+
+    Args:
+        image_paths (List[Path | BinaryIO]): Image files to convert (paths or
+                                             open binary files), in page order
+                           Example: [Path("./photo1.jpg"), Path("./photo2.png")]
+        output_path (Path | BinaryIO): Where to save the PDF, or an open binary
+                                       file (e.g. io.BytesIO) to write it into
+                            Example: Path("./photos.pdf")
+
+    EXAMPLE:
+        images_to_pdf([Path("photo1.jpg"), Path("photo2.jpg")], Path("photos.pdf"))
+        # Creates photos.pdf with two pages, one image on each
 
     IMPORTANT CONCEPTS:
-        - RGBA: Red-Green-Blue-Alpha (alpha = transparency)
-        - PDFs don't support transparency, so we convert RGBA to RGB
         - Aspect ratio: width/height ratio (keeps image from being stretched)
-        - Scaling: Making image larger or smaller to fit page
+        - Scaling: Making image smaller to fit page (images are never enlarged)
 
     COLOR MODE EXPLANATION:
         - RGB: Standard color mode (red, green, blue) - PDF compatible
-        - RGBA: RGB + Alpha channel (transparency) - needs conversion
-        - Other modes (grayscale, etc.) are converted to RGB
+        - RGBA: RGB + Alpha channel (transparency) - ReportLab stores the alpha
+          channel as a transparency mask, so see-through parts show the white page
+        - Other modes (grayscale, palette, etc.) are converted by ReportLab
     """
-    try:
-        # Open the image file using PIL (Pillow library)
-        img = Image.open(image_path)
-
-        # Convert image color mode if necessary
-        # PDFs work best with RGB (no transparency)
-
-        # Handle RGBA images (with transparency/alpha channel)
-        if img.mode == 'RGBA':
-            # Create a white RGB image the same size as original
-            rgb_img = Image.new('RGB', img.size, (255, 255, 255))  # White background
-
-            # Paste the RGBA image onto RGB background, using alpha as mask
-            # split()[3] gets the alpha channel (transparency info)
-            rgb_img.paste(img, mask=img.split()[3])
-            img = rgb_img  # Use the converted image
-        elif img.mode != 'RGB':
-            # Any other color mode (grayscale, etc.) - convert to RGB
-            img = img.convert('RGB')
-
-        # Create PDF document (letter-sized pages)
-        doc = SimpleDocTemplate(str(output_path), pagesize=letter)
-        story = []  # List to hold PDF elements
-
-        # Calculate how big the image should be to fit on the page
-        # letter page size in points: (612, 792) for 8.5" x 11"
-        page_width, page_height = letter
-
-        # Set margins (0.5 inch on all sides)
-        margin = 0.5 * inch
-
-        # Maximum size for image (page size minus margins on both sides)
-        max_width = page_width - 2 * margin   # Left + right margins
-        max_height = page_height - 2 * margin # Top + bottom margins
-
-        # Get original image dimensions (in pixels)
-        img_width, img_height = img.size
-
-        # Calculate aspect ratio (width divided by height)
-        # aspect_ratio > 1 = landscape (wider than tall)
-        # aspect_ratio < 1 = portrait (taller than wide)
-        aspect_ratio = img_width / img_height
-
-        # Check if image needs to be scaled down to fit on page
-        if img_width > max_width or img_height > max_height:
-            # Image is too big - need to scale it down
-            if aspect_ratio > 1:
-                # Landscape image (wider than tall)
-                # Scale to fit width, then adjust height proportionally
-                display_width = max_width
-                display_height = display_width / aspect_ratio
+    from PIL import Image  # Python Imaging Library - for opening and processing images
+    from reportlab.platypus import (
+        Image as RLImage,  # ReportLab's Image class (renamed to avoid conflict with PIL.Image)
+    )
+    from reportlab.platypus import PageBreak, SimpleDocTemplate  # Creates PDF documents
+
+    _configure_reportlab()
+
+    # Create PDF document (letter-sized pages, 0.5 inch margins on all sides)
+    doc = SimpleDocTemplate(
+        _pdf_destination(output_path), pagesize=letter,
+        leftMargin=IMAGE_PAGE_MARGIN, rightMargin=IMAGE_PAGE_MARGIN,
+        topMargin=IMAGE_PAGE_MARGIN, bottomMargin=IMAGE_PAGE_MARGIN,
+    )
+    story = []  # List to hold PDF elements
+
+    for image_path in image_paths:
+        try:
+            # Get original image dimensions (in pixels)
+            # Image.open() only reads the file header, so this is quick even
+            # for huge photos - ReportLab decodes the pixels later, just once
+            # (the with statement closes the image again right away)
+            with Image.open(image_path) as img:
+                img_width, img_height = img.size
+
+            # Scale the image down if it doesn't fit on the page
+            # Using the smaller of the two ratios makes both sides fit, and the
+            # same factor for width and height keeps the aspect ratio
+            # min(..., 1) means images that already fit keep their original size
+            scale = min(IMAGE_MAX_WIDTH / img_width, IMAGE_MAX_HEIGHT / img_height, 1)
+            display_width = img_width * scale
+            display_height = img_height * scale
+
+            # Create ReportLab Image object with calculated dimensions
+            # RLImage is ReportLab's Image class (renamed to avoid conflict with PIL.Image)
+            # An open file has been read by PIL already, so rewind it first
+            if isinstance(image_path, Path):
+                image_source = str(image_path)
             else:
-                # Portrait image (taller than wide) or square
-                # Scale to fit height, then adjust width proportionally
-                display_height = max_height
-                display_width = display_height * aspect_ratio
-        else:
-            # Image fits on page at original size
-            display_width = img_width
-            display_height = img_height
+                image_path.seek(0)
+                image_source = image_path
+            rl_img = RLImage(image_source, width=display_width, height=display_height)
+
+        except Exception as e:
+            # If anything goes wrong (file can't be opened, invalid format, etc.)
+            logger.error(f"Error converting image {image_path} to PDF: {e}")
+            raise  # Re-raise the exception so caller knows it failed
 
-        # Create ReportLab Image object with calculated dimensions
-        # RLImage is ReportLab's Image class (renamed to avoid conflict with PIL.Image)
-        rl_img = RLImage(str(image_path), width=display_width, height=display_height)
+        # Every image after the first starts on a new page
+        if story:
+            story.append(PageBreak())
         story.append(rl_img)  # Add image to PDF
 
-        # Build (render) the PDF
-        doc.build(story)
+    # Build (render) the PDF
+    doc.build(story)
 
-    except Exception as e:
-        # If anything goes wrong (file can't be opened, invalid format, etc.)
-        print(f"Error converting image {image_path} to PDF: {e}")
-        raise  # Re-raise the exception so caller knows it failed
 
+def _images_pdf_bytes(images: list[bytes]) -> bytes:
+    """
+    Convert images (their file contents) to one PDF and return the PDF's bytes.
 
-def merge_pdfs(pdf_paths: list[Path], output_path: Path) -> None:
+    The result is cached: converting the same images again (for example a logo
+    attached to many notes) returns the remembered PDF instead of building it
+    once more. See CONVERTED IMAGE CACHE at the top of this module.
+    """
+    # Fingerprint all of the images, in order
+    # Each image's length goes in first, so two different ways of splitting
+    # the same bytes into images can't end up with the same fingerprint
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for image_data in images:
+        fingerprint.update(len(image_data).to_bytes(8, 'little'))
+        fingerprint.update(image_data)
+    key = fingerprint.digest()
+
+    cached_pdf = _image_pdf_cache.get(key)
+    if cached_pdf is not None:
+        return cached_pdf
+
+    # Not converted before - build the PDF in memory
+    pdf_buffer = io.BytesIO()
+    images_to_pdf([io.BytesIO(image_data) for image_data in images], pdf_buffer)
+    pdf_bytes = pdf_buffer.getvalue()
+
+    # Remember small PDFs, dropping the oldest one when the cache is full
+    # (dicts keep insertion order, so the first key is the oldest)
+    if len(pdf_bytes) <= IMAGE_PDF_CACHE_MAX_PDF_SIZE:
+        if len(_image_pdf_cache) >= IMAGE_PDF_CACHE_MAX_ENTRIES:
+            del _image_pdf_cache[next(iter(_image_pdf_cache))]
+        _image_pdf_cache[key] = pdf_bytes
+
+    return pdf_bytes
+
+
+def merge_pdfs(pdf_paths: list[Union[Path, BinaryIO]], output_path: Path) -> None:
     """
     Merge multiple PDF files into one.
 
@@ -431,12 +629,16 @@ def merge_pdfs(pdf_paths: list[Path], output_path: Path) -> None:
     HOW IT WORKS:
     1. Creates a PDF writer object (for building new PDF)
     2. Loops through each input PDF
-    3. Reads all pages from each PDF
-    4. Adds each page to the writer
+    3. Reads each PDF
+    4. Appends all of its pages to the writer at once
     5. Writes the combined PDF to output file
 
+    If the optional pikepdf package is installed, it does the merge instead of
+    pypdf. pikepdf is built on the QPDF C++ library, so it's much faster for
+    large PDFs, and it writes smaller files.
+
     Args:
-        pdf_paths (List[Path]): List of PDF files to merge
+        pdf_paths (List[Path | BinaryIO]): List of PDF files (paths or open binary files) to merge
                                 Example: [Path("page1.pdf"), Path("page2.pdf")]
         output_path (Path): Where to save the merged PDF
                             Example: Path("merged.pdf")
@@ -448,9 +650,22 @@ def merge_pdfs(pdf_paths: list[Path], output_path: Path) -> None:
 
     IMPORTANT:
         - Pages are added in the order PDFs appear in the list
-        - If a PDF can't be read, it's skipped (error message printed)
+        - If a PDF can't be read, it's skipped (a warning is logged)
         - All successfully read PDFs are still merged
     """
+    # PDF library for merging - use pikepdf if it's installed (optional, much
+    # faster C++ library), otherwise pypdf (pure Python, always installed)
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+
+    if pikepdf is not None:
+        _merge_pdfs_pikepdf(pikepdf, pdf_paths, output_path)
+        return
+
+    from pypdf import PdfReader, PdfWriter  # For reading and merging existing PDF files
+
     # Create a PDF writer object
     # PdfWriter is from pypdf library - it builds new PDF files
     writer = PdfWriter()
@@ -459,32 +674,80 @@ def merge_pdfs(pdf_paths: list[Path], output_path: Path) -> None:
     for pdf_path in pdf_paths:
         try:
             # Open and read the PDF file
-            # PdfReader reads existing PDF files
-            reader = PdfReader(str(pdf_path))
+            # PdfReader reads existing PDF files (from a path or an open file)
+            reader = PdfReader(pdf_path)
 
-            # Loop through each page in this PDF
-            for page in reader.pages:
-                # Add the page to our writer (will be part of final merged PDF)
-                writer.add_page(page)
+            # Add all its pages to our writer in one call (will be part of final
+            # merged PDF) - also keeps the PDF's bookmarks
+            writer.append(reader)
 
         except Exception as e:
             # If we can't read this PDF (corrupted, permission error, etc.)
-            # Print error but continue with other PDFs
-            print(f"Error reading PDF {pdf_path}: {e}")
+            # Log the error but continue with other PDFs
+            logger.warning(f"Error reading PDF {pdf_path}: {e}")
             continue  # Skip to next PDF
 
+    # Store objects that are exactly the same only once
+    # Each merged part brings its own copy of things like the Helvetica font
+    # definition, and a repeated image is stored once per part - keeping a
+    # single copy makes the file smaller and quicker to write
+    writer.compress_identical_objects()
+
     # Write the merged PDF to the output file
     # 'wb' = write binary mode (PDFs are binary files)
+    # buffering=1 MiB: pypdf writes many small pieces; collecting them in a
+    # large buffer means far fewer writes to disk than the default 8 KiB
     # with statement ensures file is properly closed after writing
-    with open(output_path, 'wb') as output_file:
+    with open(output_path, 'wb', buffering=1024 * 1024) as output_file:
         writer.write(output_file)  # Write all collected pages to file
 
 
+def _merge_pdfs_pikepdf(
+    pikepdf, pdf_paths: list[Union[Path, BinaryIO]], output_path: Path
+) -> None:
+    """
+    Merge PDF files into one with pikepdf (used by merge_pdfs when installed).
+
+    Works the same way as the pypdf version: pages are added in order and a
+    PDF that can't be read is skipped with a warning.
+    """
+    sources = []  # Input PDFs, kept open until the merged PDF is saved
+
+    with pikepdf.Pdf.new() as merged:
+        try:
+            for pdf_path in pdf_paths:
+                try:
+                    # Pdf.open() accepts a path or an open binary file
+                    source = pikepdf.Pdf.open(pdf_path)
+                except Exception as e:
+                    # Corrupted or unreadable PDF - log it and continue with the rest
+                    logger.warning(f"Error reading PDF {pdf_path}: {e}")
+                    continue
+
+                sources.append(source)
+                # Copy all of its pages into the merged PDF in one call
+                merged.pages.extend(source.pages)
+
+            # Save the merged PDF
+            # Copied pages still read their content from the source PDFs, so
+            # the sources must stay open until this is done. Object streams
+            # pack the PDF's small objects together and compress them, which
+            # makes the file smaller.
+            merged.save(
+                output_path,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                compress_streams=True,
+            )
+        finally:
+            for source in sources:
+                source.close()
+
+
 def create_multi_item_pdf(
     text_content: Optional[str],
-    resource_paths: list[Path],
+    resources: list[tuple[str, bytes]],
     output_path: Path
-) -> tuple[bool, list[Path]]:
+) -> tuple[bool, list[tuple[str, bytes]]]:
     """
     Create a single PDF containing text and multiple resources (images/PDFs only).
 
@@ -494,121 +757,111 @@ def create_multi_item_pdf(
 
     Process:
     1. Converts text to PDF (if provided)
-    2. Converts images to PDFs
+    2. Converts images to PDFs (images next to each other share one PDF)
     3. Includes existing PDFs
     4. Merges everything into one PDF
+       (a note with only images, or with just one PDF, is written straight
+       to the output - no merge)
     5. Returns list of files that couldn't be included
 
     Args:
         text_content (Optional[str]): Text to include (can be None if no text)
-        resource_paths (List[Path]): List of file paths to include
+        resources (List[Tuple[str, bytes]]): (file name, file contents) pairs to include
                                      Can contain images, PDFs, or unsupported files
+                                     The name's extension decides how each file is handled
         output_path (Path): Where to save the final merged PDF
 
     Returns:
-        Tuple[bool, List[Path]]:
+        Tuple[bool, List[Tuple[str, bytes]]]:
             - First value (bool): True if PDF was created, False if no content
-            - Second value (List[Path]): Files that couldn't be merged (videos, ZIPs, etc.)
+            - Second value (list): (name, contents) pairs that couldn't be merged (videos, ZIPs, etc.)
 
     EXAMPLE:
         text = "Meeting notes"
-        files = [Path("photo.jpg"), Path("document.pdf"), Path("video.mp4")]
+        files = [("photo.jpg", photo_bytes), ("document.pdf", pdf_bytes), ("video.mp4", video_bytes)]
         success, unsupported = create_multi_item_pdf(text, files, Path("output.pdf"))
         # Creates output.pdf with text + photo + document
-        # Returns: (True, [Path("video.mp4")])
+        # Returns: (True, [("video.mp4", video_bytes)])
 
     IMPORTANT CONCEPTS:
-        - Temporary files: We create intermediate PDFs, then merge them
+        - Intermediate PDFs: the text and each image become a small PDF first,
+          then all of them are merged
+        - In memory: neither the attachments nor the intermediate PDFs are
+          written to disk before merging; io.BytesIO lets ReportLab, PIL and
+          pypdf write and read bytes as if they were files
         - Unsupported files: Videos, ZIPs, etc. can't be in PDF - returned to caller
-        - Cleanup: Temporary files are deleted after merging (in 'finally' block)
 
     WORKFLOW:
         Text → PDF → |
-        Image1 → PDF → | → Merge all → Final PDF
-        Image2 → PDF → |
+        Image1 + Image2 → PDF → | → Merge all → Final PDF
         PDF1 → PDF → |
     """
     # Lists to track files we're working with
-    temp_pdfs = []          # PDFs we'll merge (text PDF, image PDFs, existing PDFs)
-    unsupported_files = []  # Files we can't merge (returned to caller)
-
-    # Create temporary directory for intermediate PDF files
-    # These will be deleted after we merge them
-    temp_dir = output_path.parent / ".temp_pdfs"
-    temp_dir.mkdir(exist_ok=True)
+    pdfs_to_merge = []      # In-memory PDFs we'll merge (text PDF, image PDFs, existing PDFs)
+    unsupported_files = []  # (name, contents) pairs we can't merge (returned to caller)
+    image_run = []          # Contents of images in a row (converted to one PDF together)
+
+    def convert_image_run():
+        # Render the images collected so far into one in-memory PDF
+        # (done before each attached PDF, so the pages stay in the note's order)
+        if image_run:
+            pdfs_to_merge.append(io.BytesIO(_images_pdf_bytes(image_run)))
+            image_run.clear()
+
+    # STEP 1: Convert text to PDF (if text content exists)
+    if text_content:
+        # Render the text into an in-memory buffer instead of a temporary file
+        text_pdf = io.BytesIO()
+        create_text_pdf(text_content, text_pdf)
+
+        # Add to list of PDFs to merge
+        pdfs_to_merge.append(text_pdf)
+
+    # STEP 2: Process each resource file
+    for resource_name, resource_data in resources:
+        # Determine what type of file this is (from its name's extension)
+        # splitext() splits "photo.JPG" into ("photo", ".JPG")
+        file_type = EXT_CATEGORY.get(os.path.splitext(resource_name)[1].lower(), 'unknown')
+
+        if file_type == 'pdf':
+            # Already a PDF - can merge directly
+            # No conversion needed, just add to merge list (after the images before it)
+            convert_image_run()
+            pdfs_to_merge.append(io.BytesIO(resource_data))
+
+        elif file_type == 'image':
+            # Image file - collect it; it's converted to PDF together with
+            # the images next to it
+            image_run.append(resource_data)
 
-    # Use try/finally to ensure cleanup happens even if errors occur
-    try:
-        # STEP 1: Convert text to PDF (if text content exists)
-        if text_content:
-            # Create temporary PDF filename for text
-            text_pdf = temp_dir / f"text_{generate_unique_id()}.pdf"
-
-            # Convert text to PDF
-            create_text_pdf(text_content, text_pdf)
-
-            # Add to list of PDFs to merge
-            temp_pdfs.append(text_pdf)
-
-        # STEP 2: Process each resource file
-        for idx, resource_path in enumerate(resource_paths):
-            # Determine what type of file this is
-            file_type = categorize_file_type(resource_path)
-
-            if file_type == 'pdf':
-                # Already a PDF - can merge directly
-                # No conversion needed, just add to merge list
-                temp_pdfs.append(resource_path)
-
-            elif file_type == 'image':
-                # Image file - convert to PDF first
-                # Create temporary PDF filename
-                temp_pdf = temp_dir / f"img_{idx}_{generate_unique_id()}.pdf"
-
-                # Convert image to PDF
-                image_to_pdf(resource_path, temp_pdf)
-
-                # Add converted PDF to merge list
-                temp_pdfs.append(temp_pdf)
-
-            elif file_type in ['unsupported', 'unknown']:
-                # Can't include this in PDF (video, ZIP, etc.)
-                # Add to unsupported list - caller must handle separately
-                unsupported_files.append(resource_path)
-                print(f"⚠️  Unsupported file type for PDF merge: {resource_path.name}")
-
-        # STEP 3: Merge all PDFs into one
-        if temp_pdfs:
-            # We have PDFs to merge - combine them all
-            merge_pdfs(temp_pdfs, output_path)
-            return (True, unsupported_files)  # Success!
         else:
-            # No PDFs to merge (maybe only unsupported files?)
-            return (False, unsupported_files)  # Nothing created
-
-    finally:
-        # CLEANUP: Always runs, even if errors occurred
-        # Delete temporary PDF files we created
-
-        # Loop through all temporary PDFs
-        for temp_pdf in temp_pdfs:
-            # Only delete files in temp directory (not original PDFs)
-            # Check exists() to avoid errors if already deleted
-            if temp_pdf.parent == temp_dir and temp_pdf.exists():
-                try:
-                    temp_pdf.unlink()  # Delete the temporary file
-                except Exception:
-                    # If deletion fails, continue anyway
-                    pass
-
-        # Remove temporary directory if it's empty
-        try:
-            # Check if directory exists and has no files
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()  # Delete empty directory
-        except Exception:
-            # If removal fails, continue anyway
-            pass
+            # 'unsupported' or 'unknown' - the only other categories
+            # Can't include this in PDF (video, ZIP, etc.)
+            # Add to unsupported list - caller must handle separately
+            unsupported_files.append((resource_name, resource_data))
+            # (the caller logs one warning per note, so this is only shown with --verbose)
+            logger.debug(f"Unsupported file type for PDF merge: {resource_name}")
+
+    # Only images (no text, no PDFs): write their PDF straight to the output file
+    # One PDF is all we need, so there's nothing to merge
+    if image_run and not pdfs_to_merge:
+        output_path.write_bytes(_images_pdf_bytes(image_run))
+        return (True, unsupported_files)  # Success!
+
+    # STEP 3: Merge all PDFs into one
+    convert_image_run()
+    if len(pdfs_to_merge) == 1:
+        # Only one PDF (e.g. an attached PDF next to a video) - nothing to
+        # merge, so save its bytes as they are instead of re-writing it
+        output_path.write_bytes(pdfs_to_merge[0].getvalue())
+        return (True, unsupported_files)  # Success!
+    elif pdfs_to_merge:
+        # We have PDFs to merge - combine them all
+        merge_pdfs(pdfs_to_merge, output_path)
+        return (True, unsupported_files)  # Success!
+    else:
+        # No PDFs to merge (maybe only unsupported files?)
+        return (False, unsupported_files)  # Nothing created
 
 
 def should_create_multi_item_pdf(text_content: Optional[str], resources_count: int) -> bool:
@@ -658,21 +911,13 @@ def should_create_multi_item_pdf(text_content: Optional[str], resources_count: i
         Yes    1           True  (text + resource)
         Yes    2+          True  (text + multiple resources)
     """
-    # Check if note has text content
-    # text_content is not None AND has non-whitespace characters
-    # .strip() removes leading/trailing spaces/tabs/newlines
-    has_text = text_content is not None and text_content.strip()
-
     # CASE 1: Multiple resources (2 or more)
-    # Even without text, multiple resources should be combined
-    if resources_count > 1:
-        return True  # Create multi-item PDF
-
+    #   Even without text, multiple resources should be combined
     # CASE 2: Text AND at least one resource
-    # Combining text with attachments creates a unified document
-    if has_text and resources_count >= 1:
-        return True  # Create multi-item PDF
-
-    # All other cases: single resource or text-only
-    # These are handled by other functions
-    return False
+    #   Combining text with attachments creates a unified document
+    #   (text counts if it has non-whitespace characters; it's only
+    #   checked when there is exactly one resource)
+    # All other cases (single resource or text-only) are handled by other functions
+    return resources_count > 1 or (
+        resources_count == 1 and bool(text_content and not text_content.isspace())
+    )